@@ -0,0 +1,291 @@
+"""
+Offline benchmarks for the function-tool layer.
+
+Times every tool in function_handlers (through execute_function_tool and
+through the bare handler, i.e. with and without the response cache),
+search_portfolio over a query corpus, PortfolioDataProvider construction
+and format_portfolio_for_agent. Each benchmark runs against synthetic
+portfolios built by replicating the hardcoded data 10x, 100x and 1000x.
+
+Results are written as JSON keyed by commit so runs can be diffed:
+
+    uv run python scripts/benchmark_tools.py
+    uv run python scripts/benchmark_tools.py --compare .cache/benchmarks/<sha>.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from functools import partial
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from function_tools import (
+    GetExperienceParams,
+    GetMoreParams,
+    GetProjectsParams,
+    GetSkillsParams,
+    PortfolioDataProvider,
+    SearchPortfolioParams,
+    execute_function_tool,
+    function_handlers,
+)
+from portfolio_data import (
+    PortfolioConfig,
+    format_portfolio_for_agent,
+    load_hardcoded_data,
+)
+
+DEFAULT_SCALES = (10, 100, 1000)
+DEFAULT_OUTPUT_DIR = os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "benchmarks"
+)
+
+SEARCH_QUERIES = [
+    "redis",
+    "redis caching",
+    "kubernetes",
+    "kube",
+    "react frontend",
+    "typescript websocket",
+    "machine learning",
+    "pytorch open ran",
+    "microservices latency",
+    "nestjs elasticsearch",
+    "python",
+    "aws docker",
+    "healthtrip",
+    "mcp server",
+    "distributed systems",
+    "c++",
+    "graphql",
+    "nothing matches this",
+]
+
+# Time budget for one measurement round, and rounds per benchmark
+TARGET_ROUND_SECONDS = 0.2
+ROUNDS = 5
+
+
+def scale_portfolio(base: PortfolioConfig, factor: int) -> PortfolioConfig:
+    """Replicate every list in the portfolio factor times with unique names"""
+
+    def suffix(value: str, copy: int) -> str:
+        return f"{value} {copy}" if copy else value
+
+    copies = range(factor)
+    return replace(
+        base,
+        experience=[
+            replace(exp, id=f"{exp.id}-{i}", company=suffix(exp.company, i))
+            for i in copies
+            for exp in base.experience
+        ],
+        projects=[
+            replace(project, id=f"{project.id}-{i}", title=suffix(project.title, i))
+            for i in copies
+            for project in base.projects
+        ],
+        skills=[
+            replace(skill, name=suffix(skill.name, i))
+            for i in copies
+            for skill in base.skills
+        ],
+        education=[
+            replace(edu, id=f"{edu.id}-{i}", institution=suffix(edu.institution, i))
+            for i in copies
+            for edu in base.education
+        ],
+    )
+
+
+def tool_cases(data: PortfolioConfig) -> List[Tuple[str, str, Dict[str, Any], Any]]:
+    """(label, function name, args, handler params) covering every handler"""
+    company = data.experience[-1].company
+    project_id = data.projects[-1].id
+    cases = [
+        ("getExperience", "getExperience", {}, GetExperienceParams()),
+        (
+            "getExperience(company)",
+            "getExperience",
+            {"company": company},
+            GetExperienceParams(company),
+        ),
+        ("getProjects", "getProjects", {}, GetProjectsParams()),
+        (
+            "getProjects(featured)",
+            "getProjects",
+            {"featured": True},
+            GetProjectsParams(featured=True),
+        ),
+        (
+            "getProjects(projectId)",
+            "getProjects",
+            {"projectId": project_id},
+            GetProjectsParams(project_id=project_id),
+        ),
+        ("getSkills", "getSkills", {}, GetSkillsParams()),
+        (
+            "getSkills(category)",
+            "getSkills",
+            {"category": "backend"},
+            GetSkillsParams("backend"),
+        ),
+        ("getEducation", "getEducation", {}, None),
+        ("getContactInfo", "getContactInfo", {}, None),
+        ("getPersonalInfo", "getPersonalInfo", {}, None),
+        ("getPortfolioSummary", "getPortfolioSummary", {}, None),
+        (
+            "searchPortfolio",
+            "searchPortfolio",
+            {"query": "redis caching"},
+            SearchPortfolioParams("redis caching"),
+        ),
+        (
+            "getMore",
+            "getMore",
+            {"handle": "getExperience?page=2"},
+            GetMoreParams("getExperience?page=2"),
+        ),
+    ]
+    missing = set(function_handlers) - {case[1] for case in cases}
+    if missing:
+        raise RuntimeError(f"No benchmark case for tools: {sorted(missing)}")
+    return cases
+
+
+def measure(func: Callable[[], Any]) -> Dict[str, float]:
+    """Per-call timings in microseconds, timeit-style"""
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    number = max(1, int(TARGET_ROUND_SECONDS / max(single, 1e-9)))
+    rounds = ROUNDS if single * number * ROUNDS < 30 else 1
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "min_us": round(min(per_call), 3),
+        "median_us": round(median(per_call), 3),
+        "loops": number,
+        "rounds": rounds,
+    }
+
+
+def run_benchmarks(scales: List[int], only: Optional[str]) -> Dict[str, Any]:
+    base = load_hardcoded_data()
+    results: Dict[str, Dict[str, float]] = {}
+
+    def bench(name: str, func: Callable[[], Any]):
+        if only and only not in name:
+            return
+        results[name] = measure(func)
+        print(f"{name:<60} {results[name]['median_us']:>14.2f} us", flush=True)
+
+    for scale in scales:
+        data = scale_portfolio(base, scale)
+        prefix = f"x{scale}"
+
+        bench(
+            f"{prefix}/format_portfolio_for_agent",
+            partial(format_portfolio_for_agent, data),
+        )
+        bench(f"{prefix}/provider_construction", partial(PortfolioDataProvider, data))
+
+        provider = PortfolioDataProvider(data)
+        for label, function_name, args, params in tool_cases(data):
+            handler = function_handlers[function_name]
+            bench(
+                f"{prefix}/execute_function_tool/{label}",
+                partial(execute_function_tool, function_name, args, provider),
+            )
+            handler_args = (provider,) if params is None else (provider, params)
+            bench(f"{prefix}/handler/{label}", partial(handler, *handler_args))
+
+        for query in SEARCH_QUERIES:
+            bench(
+                f"{prefix}/search_portfolio/{query}",
+                partial(provider.search_portfolio, query),
+            )
+
+    return results
+
+
+def git_revision() -> str:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]):
+    """Print median ratios against a baseline run"""
+    print(f"\nComparison with {baseline['revision']} (current / baseline median):")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median_us"] / max(before["median_us"], 1e-9)
+        marker = "  <-- slower" if ratio > 1.1 else ("  faster" if ratio < 0.9 else "")
+        print(f"{name:<60} {ratio:>8.2f}x{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scales",
+        default=",".join(str(scale) for scale in DEFAULT_SCALES),
+        help="Comma-separated multiples of the hardcoded portfolio",
+    )
+    parser.add_argument("--filter", help="Only run benchmarks containing this text")
+    parser.add_argument("--output", help="Result file (default: by git revision)")
+    parser.add_argument("--compare", help="Baseline result file to diff against")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    run = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": run_benchmarks(
+            [int(scale) for scale in args.scales.split(",")], args.filter
+        ),
+    }
+
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), run)
+
+
+if __name__ == "__main__":
+    main()
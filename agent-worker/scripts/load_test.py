@@ -0,0 +1,458 @@
+"""
+Synthetic load generator for the portfolio voice agent.
+
+Runs N concurrent AgentSessions with PortfolioAssistant in one process,
+with deterministic fakes standing in for LiveKit, Deepgram and Gemini:
+
+- FakeLLM answers scripted questions by calling the matching tool, then
+  replies with text, after a configurable time to first token
+- FakeTTS returns silent PCM sized to the reply after a configurable
+  time to first byte, and NullAudioOutput "plays" it at real-time speed
+- Each user turn is fed as a series of interim transcripts (which drive
+  tool prefetch) followed by the final transcript after the STT delay
+
+It reports event-loop lag, memory growth, tool latency, turn latency and
+throughput, so the number of rooms one worker process can hold before
+audio degrades can be found locally:
+
+    uv run python scripts/load_test.py --sessions 50
+    uv run python scripts/load_test.py --sweep 10,25,50,100,200 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from livekit.agents import (
+    DEFAULT_API_CONNECT_OPTIONS,
+    AgentSession,
+    APIConnectOptions,
+    llm,
+    tts,
+)
+from livekit.agents.utils import shortuuid
+from livekit.agents.voice import io
+
+from agent import PortfolioAssistant
+from latency_histogram import LatencyHistogram
+from logger import logger
+from session_monitor import session_monitor
+
+# (user transcript, tool the LLM calls for it, tool arguments)
+SCRIPT: List[Tuple[str, Optional[str], Dict[str, Any]]] = [
+    ("hey, who am I talking to", None, {}),
+    ("what did he do at healthtrip", "get_experience", {"company": "Healthtrip"}),
+    (
+        "tell me about the leetcode project",
+        "get_projects",
+        {"project_id": "LeetCode MCP Server"},
+    ),
+    ("which backend skills does he have", "get_skills", {"category": "backend"}),
+    (
+        "has he worked with redis caching",
+        "search_portfolio",
+        {"query": "redis caching"},
+    ),
+    ("where did he study", "get_education", {}),
+    ("how can I book a meeting with him", "get_contact_info", {}),
+]
+
+SAMPLE_RATE = 24000
+# Rough speaking rate used to size synthesized audio
+SECONDS_PER_CHARACTER = 0.06
+# Audio is delivered in 20ms frames; a loop stall longer than that is audible
+AUDIO_FRAME_MS = 20
+LAG_SAMPLE_INTERVAL = 0.02
+
+
+@dataclass
+class LoadConfig:
+    llm_ttft: float = 0.35
+    tts_ttfb: float = 0.2
+    stt_delay: float = 0.15
+    interim_interval: float = 0.1
+    playback_speed: float = 1.0
+    think_time: float = 0.5
+
+
+class FakeLLMStream(llm.LLMStream):
+    async def _run(self) -> None:
+        fake: FakeLLM = self._llm  # type: ignore[assignment]
+        await asyncio.sleep(fake.ttft)
+
+        items = self.chat_ctx.items
+        last = items[-1] if items else None
+        request_id = shortuuid()
+        delta: llm.ChoiceDelta
+
+        if last is not None and last.type == "function_call_output":
+            delta = llm.ChoiceDelta(
+                role="assistant",
+                content=f"Here's what I found: {last.output[:120]}",
+            )
+        else:
+            user_text = ""
+            if last is not None and last.type == "message":
+                user_text = last.text_content or ""
+            tool_name, args = fake.script.get(user_text.strip().lower(), (None, {}))
+            if tool_name:
+                delta = llm.ChoiceDelta(
+                    role="assistant",
+                    tool_calls=[
+                        llm.FunctionToolCall(
+                            name=tool_name,
+                            arguments=json.dumps(args),
+                            call_id=f"call_{request_id}",
+                        )
+                    ],
+                )
+            else:
+                delta = llm.ChoiceDelta(
+                    role="assistant",
+                    content="I'm the portfolio assistant, ask me anything about it.",
+                )
+
+        self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=delta))
+
+
+class FakeLLM(llm.LLM):
+    def __init__(self, ttft: float):
+        super().__init__()
+        self.ttft = ttft
+        self.script = {
+            text: (tool_name, args) for text, tool_name, args in SCRIPT if tool_name
+        }
+
+    @property
+    def model(self) -> str:
+        return "fake-llm"
+
+    @property
+    def provider(self) -> str:
+        return "load-test"
+
+    def chat(
+        self,
+        *,
+        chat_ctx: llm.ChatContext,
+        tools: Optional[list] = None,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+        **kwargs: Any,
+    ) -> llm.LLMStream:
+        return FakeLLMStream(
+            self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options
+        )
+
+
+class FakeChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        fake: FakeTTS = self._tts  # type: ignore[assignment]
+        await asyncio.sleep(fake.ttfb)
+        output_emitter.initialize(
+            request_id=shortuuid(),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+            mime_type="audio/pcm",
+        )
+        samples = int(len(self.input_text) * SECONDS_PER_CHARACTER * SAMPLE_RATE)
+        output_emitter.push(bytes(samples * 2))
+        output_emitter.flush()
+
+
+class FakeTTS(tts.TTS):
+    def __init__(self, ttfb: float):
+        super().__init__(
+            capabilities=tts.TTSCapabilities(streaming=False),
+            sample_rate=SAMPLE_RATE,
+            num_channels=1,
+        )
+        self.ttfb = ttfb
+
+    def synthesize(
+        self,
+        text: str,
+        *,
+        conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+    ) -> tts.ChunkedStream:
+        return FakeChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class NullAudioOutput(io.AudioOutput):
+    """Discards audio, reporting playback finished after its real duration"""
+
+    def __init__(self, playback_speed: float):
+        super().__init__(
+            label="null",
+            capabilities=io.AudioOutputCapabilities(pause=True),
+            sample_rate=SAMPLE_RATE,
+        )
+        self.playback_speed = playback_speed
+        self._pushed_duration = 0.0
+        self._playback_task: Optional[asyncio.Task] = None
+        self.segment_starts: List[float] = []
+
+    async def capture_frame(self, frame) -> None:
+        if not self._pushed_duration:
+            self.segment_starts.append(time.perf_counter())
+        await super().capture_frame(frame)
+        self._pushed_duration += frame.duration
+
+    def flush(self) -> None:
+        super().flush()
+        duration, self._pushed_duration = self._pushed_duration, 0.0
+        self._playback_task = asyncio.create_task(self._play(duration))
+
+    def clear_buffer(self) -> None:
+        if self._playback_task and not self._playback_task.done():
+            self._playback_task.cancel()
+            self.on_playback_finished(playback_position=0.0, interrupted=True)
+        self._pushed_duration = 0.0
+
+    def pause(self) -> None:
+        # Playback is simulated; pausing only needs to be accepted
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    async def _play(self, duration: float):
+        if self.playback_speed > 0:
+            await asyncio.sleep(duration / self.playback_speed)
+        self.on_playback_finished(playback_position=duration, interrupted=False)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag and attributes it to the sessions running"""
+
+    def __init__(self):
+        self.process = LatencyHistogram()
+        self.per_session: Dict[str, LatencyHistogram] = {}
+        self.active: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + LAG_SAMPLE_INTERVAL
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            lag_ms = max(0.0, (time.perf_counter() - expected) * 1000)
+            self.process.record(lag_ms)
+            for session_id in self.active:
+                self.per_session[session_id].record(lag_ms)
+
+
+@dataclass
+class RunResult:
+    sessions: int
+    turns: int = 0
+    failed_sessions: int = 0
+    wall_time: float = 0.0
+    rss_growth_kb: int = 0
+    turn_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    response_latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    lag: Optional[LoopLagMonitor] = None
+
+
+def _rss_kb() -> int:
+    """Current resident set size, falling back to the peak where unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def run_session(
+    index: int,
+    turns: int,
+    load: LoadConfig,
+    lag: LoopLagMonitor,
+    result: RunResult,
+):
+    session_id = f"load-{index}"
+    session_monitor.start_session(session_id, session_id)
+    lag.per_session[session_id] = LatencyHistogram()
+    lag.active.add(session_id)
+
+    assistant = PortfolioAssistant(session_id)
+    session = AgentSession(llm=FakeLLM(load.llm_ttft), tts=FakeTTS(load.tts_ttfb))
+    audio = NullAudioOutput(load.playback_speed)
+    session.output.audio = audio
+    status = "completed"
+    try:
+        await session.start(assistant)
+        for turn in range(turns):
+            text, _, _ = SCRIPT[(index + turn) % len(SCRIPT)]
+            turn_start = time.perf_counter()
+
+            # Fake STT: interim transcripts while speaking, then the final one
+            words = text.split()
+            for count in range(1, len(words) + 1):
+                assistant.prefetcher.on_transcript(" ".join(words[:count]))
+                await asyncio.sleep(load.interim_interval)
+            await asyncio.sleep(load.stt_delay)
+
+            final_transcript_at = time.perf_counter()
+            await session.run(user_input=text)
+            result.turn_latency.record((time.perf_counter() - turn_start) * 1000)
+            # Time from the final transcript until reply audio starts
+            replies = [t for t in audio.segment_starts if t >= final_transcript_at]
+            if replies:
+                result.response_latency.record(
+                    (replies[0] - final_transcript_at) * 1000
+                )
+            audio.segment_starts.clear()
+            result.turns += 1
+            await asyncio.sleep(load.think_time * random.uniform(0.5, 1.5))
+    except Exception as e:
+        status = "failed"
+        result.failed_sessions += 1
+        logger.error(
+            "Load test session failed", {"session": session_id, "error": str(e)}
+        )
+    finally:
+        lag.active.discard(session_id)
+        await session.aclose()
+        session_monitor.end_session(session_id, status=status)
+
+
+async def run_load(
+    sessions: int, turns: int, ramp_up: float, load: LoadConfig
+) -> RunResult:
+    # One quick session first so lazy imports and plugin setup are not
+    # counted as per-session memory growth
+    warm_up = replace(load, playback_speed=0, think_time=0)
+    await run_session(-1, 1, warm_up, LoopLagMonitor(), RunResult(sessions=1))
+    session_monitor.reset_latencies()
+
+    result = RunResult(sessions=sessions)
+    lag = LoopLagMonitor()
+    result.lag = lag
+    lag.start()
+
+    rss_before = _rss_kb()
+    start = time.perf_counter()
+    tasks = []
+    for index in range(sessions):
+        tasks.append(asyncio.create_task(run_session(index, turns, load, lag, result)))
+        if ramp_up:
+            await asyncio.sleep(ramp_up / sessions)
+    await asyncio.gather(*tasks)
+    result.wall_time = time.perf_counter() - start
+    result.rss_growth_kb = _rss_kb() - rss_before
+    lag.stop()
+    return result
+
+
+def summarize(result: RunResult) -> Dict[str, Any]:
+    lag = result.lag
+    assert lag is not None
+    session_lag_p99 = sorted(
+        histogram.percentile(99) or 0.0 for histogram in lag.per_session.values()
+    )
+    degraded = sum(1 for value in session_lag_p99 if value > AUDIO_FRAME_MS)
+    tool_latency = {
+        metric: histogram.summary()
+        for metric, histogram in sorted(session_monitor.process_latencies().items())
+        if metric.startswith("tool.")
+    }
+    return {
+        "sessions": result.sessions,
+        "failed_sessions": result.failed_sessions,
+        "turns": result.turns,
+        "wall_time_s": round(result.wall_time, 2),
+        "turns_per_second": round(result.turns / result.wall_time, 2)
+        if result.wall_time
+        else 0.0,
+        "turn_latency_ms": result.turn_latency.summary(),
+        "response_latency_ms": result.response_latency.summary(),
+        "loop_lag_ms": lag.process.summary(),
+        "sessions_with_audible_lag": degraded,
+        "worst_session_lag_p99_ms": round(session_lag_p99[-1], 2)
+        if session_lag_p99
+        else None,
+        "rss_growth_kb": result.rss_growth_kb,
+        "rss_growth_per_session_kb": round(result.rss_growth_kb / result.sessions, 1),
+        "tool_latency_ms": tool_latency,
+    }
+
+
+def print_summary(summary: Dict[str, Any]):
+    lag = summary["loop_lag_ms"]
+    response = summary["response_latency_ms"]
+    print(
+        f"sessions={summary['sessions']:<5} turns/s={summary['turns_per_second']:<8}"
+        f" response p50/p95={response['p50']}/{response['p95']}ms"
+        f" loop lag p50/p99/max={lag['p50']}/{lag['p99']}/{lag['max']}ms"
+        f" audible-lag sessions={summary['sessions_with_audible_lag']}"
+        f" rss +{summary['rss_growth_kb']}KB"
+        f" failed={summary['failed_sessions']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument(
+        "--sweep", help="Comma-separated session counts to run one after another"
+    )
+    parser.add_argument("--turns", type=int, default=len(SCRIPT))
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="Seconds")
+    parser.add_argument("--llm-ttft", type=float, default=LoadConfig.llm_ttft)
+    parser.add_argument("--tts-ttfb", type=float, default=LoadConfig.tts_ttfb)
+    parser.add_argument("--stt-delay", type=float, default=LoadConfig.stt_delay)
+    parser.add_argument(
+        "--playback-speed",
+        type=float,
+        default=LoadConfig.playback_speed,
+        help="Multiple of real time; 0 skips playback waits",
+    )
+    parser.add_argument("--think-time", type=float, default=LoadConfig.think_time)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write full results to this file")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    logger.set_level("warning")
+    load = LoadConfig(
+        llm_ttft=args.llm_ttft,
+        tts_ttfb=args.tts_ttfb,
+        stt_delay=args.stt_delay,
+        playback_speed=args.playback_speed,
+        think_time=args.think_time,
+    )
+    counts = (
+        [int(count) for count in args.sweep.split(",")]
+        if args.sweep
+        else [args.sessions]
+    )
+
+    summaries = []
+    for count in counts:
+        result = asyncio.run(run_load(count, args.turns, args.ramp_up, load))
+        summary = summarize(result)
+        summaries.append(summary)
+        print_summary(summary)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
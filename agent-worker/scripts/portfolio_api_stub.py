@@ -0,0 +1,77 @@
+"""
+Local stub of the website's portfolio API.
+
+Serves config/portfolio.ts as JSON with ETag and Last-Modified headers so
+the agent's API loader can be exercised offline, including 304 responses,
+slow responses and failures.
+
+Usage:
+    uv run python scripts/portfolio_api_stub.py --port 8787
+    PORTFOLIO_API_URL=http://localhost:8787/api/portfolio uv run src/agent.py dev
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+from email.utils import formatdate
+
+from aiohttp import web
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from ts_config_parser import parse_exported_object
+
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "config", "portfolio.ts"
+)
+
+
+def create_app(config_path: str, delay: float = 0.0, fail_rate: float = 0.0):
+    async def portfolio(request: web.Request) -> web.Response:
+        if delay:
+            await asyncio.sleep(delay)
+        if fail_rate and random.random() < fail_rate:
+            return web.Response(status=503, text="Stub failure")
+
+        with open(config_path, "rb") as f:
+            content = f.read()
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        last_modified = formatdate(os.path.getmtime(config_path), usegmt=True)
+
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(
+                status=304, headers={"ETag": etag, "Last-Modified": last_modified}
+            )
+
+        body = json.dumps(parse_exported_object(content.decode("utf-8")))
+        return web.Response(
+            text=body,
+            content_type="application/json",
+            headers={"ETag": etag, "Last-Modified": last_modified},
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/portfolio", portfolio)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="Seconds to wait per request"
+    )
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="Fraction of requests to fail"
+    )
+    args = parser.parse_args()
+    web.run_app(create_app(args.config, args.delay, args.fail_rate), port=args.port)
+
+
+if __name__ == "__main__":
+    main()
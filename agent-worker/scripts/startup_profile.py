@@ -0,0 +1,177 @@
+"""
+Startup-time breakdown for the agent worker.
+
+Worker spawn time decides how fast the fleet scales out, so this reports
+where a fresh process spends its startup:
+
+- import cost of each entry point, from CPython's -X importtime, grouped
+  by top-level package with the most expensive modules listed
+- wall-clock import time of each entry point, best of several fresh runs
+- prewarm cost per resource, from the worker's own prewarm hook
+
+Entry points are the full worker (agent) and the tool-only layer
+(function_tools), which must not pull in the LiveKit voice stack:
+
+    uv run python scripts/startup_profile.py
+    uv run python scripts/startup_profile.py --modules agent --top 30 --json out.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import types
+from typing import Any, Dict, List, Tuple
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+DEFAULT_MODULES = ("agent", "function_tools")
+# Entry points that must stay importable without the voice stack
+VOICE_FREE_MODULES = {"function_tools"}
+VOICE_STACK_PACKAGES = ("livekit", "onnxruntime", "google", "openai")
+
+PREWARM_MARKER = "PREWARM_TIMES "
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """(module, depth, self us, cumulative us) for each -X importtime line"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return modules
+
+
+def import_profile(module: str, top: int) -> Dict[str, Any]:
+    modules = parse_importtime(
+        _run_python("-X", "importtime", "-c", f"import {module}").stderr
+    )
+    by_package: Dict[str, int] = {}
+    for name, _depth, self_us, _cumulative_us in modules:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    target = next((m for m in modules if m[0] == module), None)
+    return {
+        "total_ms": round(target[3] / 1000, 1) if target else None,
+        "module_count": len(modules),
+        "packages_ms": {
+            package: round(us / 1000, 1)
+            for package, us in sorted(by_package.items(), key=lambda item: -item[1])
+        },
+        "slowest_modules_ms": [
+            (name, round(cumulative_us / 1000, 1))
+            for name, _depth, _self_us, cumulative_us in sorted(
+                modules, key=lambda m: -m[3]
+            )[:top]
+        ],
+        "voice_stack_loaded": sorted(
+            {
+                name.split(".")[0]
+                for name, *_ in modules
+                if name.split(".")[0] in VOICE_STACK_PACKAGES
+            }
+        ),
+    }
+
+
+def wall_import_ms(module: str, repeat: int) -> float:
+    """Best-of-N wall-clock import time in a fresh interpreter"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print((time.perf_counter() - start) * 1000)"
+    )
+    return round(
+        min(float(_run_python("-c", code).stdout.strip()) for _ in range(repeat)), 1
+    )
+
+
+def prewarm_profile() -> Dict[str, float]:
+    """Run the worker's prewarm hook in a fresh process and collect load times"""
+    output = _run_python(os.path.abspath(__file__), "--prewarm-child").stdout
+    for line in output.splitlines():
+        if line.startswith(PREWARM_MARKER):
+            return json.loads(line[len(PREWARM_MARKER) :])
+    raise RuntimeError("Prewarm child did not report load times")
+
+
+def _prewarm_child():
+    sys.path.insert(0, SRC_DIR)
+    import agent
+    from prewarm import get_resource_registry
+
+    proc = types.SimpleNamespace(userdata={})
+    agent.prewarm(proc)
+    times = get_resource_registry(proc).load_times_ms
+    print(PREWARM_MARKER + json.dumps({k: round(v, 1) for k, v in times.items()}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--modules",
+        default=",".join(DEFAULT_MODULES),
+        help="Comma-separated entry-point modules to profile",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    parser.add_argument("--repeat", type=int, default=3, help="Wall-clock runs")
+    parser.add_argument("--no-prewarm", action="store_true")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--prewarm-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.prewarm_child:
+        _prewarm_child()
+        return
+
+    report: Dict[str, Any] = {"imports": {}}
+    failed = False
+    for module in args.modules.split(","):
+        profile = import_profile(module, args.top)
+        profile["wall_ms"] = wall_import_ms(module, args.repeat)
+        report["imports"][module] = profile
+
+        print(
+            f"\nimport {module}: {profile['wall_ms']} ms wall, "
+            f"{profile['total_ms']} ms under -X importtime, "
+            f"{profile['module_count']} modules"
+        )
+        print("  by package (self time):")
+        for package, ms in list(profile["packages_ms"].items())[:10]:
+            print(f"    {package:<40} {ms:>10.1f} ms")
+        print("  slowest modules (cumulative):")
+        for name, ms in profile["slowest_modules_ms"]:
+            print(f"    {name:<60} {ms:>10.1f} ms")
+        if module in VOICE_FREE_MODULES and profile["voice_stack_loaded"]:
+            failed = True
+            print(f"  !! pulls in the voice stack: {profile['voice_stack_loaded']}")
+
+    if not args.no_prewarm:
+        report["prewarm_ms"] = prewarm_profile()
+        print("\nprewarm:")
+        for name, ms in report["prewarm_ms"].items():
+            print(f"    {name:<40} {ms:>10.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
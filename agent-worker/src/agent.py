@@ -1,156 +1,287 @@
-from typing import Optional
+import asyncio
+import atexit
+import sys
+import time
+from typing import AsyncIterable, List, Optional, Union
+
 from livekit.agents import (
     Agent,
     AgentSession,
+    AgentStateChangedEvent,
+    ErrorEvent,
     JobContext,
+    JobExecutorType,
     JobProcess,
     MetricsCollectedEvent,
+    ModelSettings,
     RoomInputOptions,
     RunContext,
+    UserInputTranscribedEvent,
     WorkerOptions,
     cli,
     function_tool,
     inference,
+    llm,
     metrics,
+    stt,
+    tts,
 )
-from livekit.plugins import silero, deepgram, google
-import sys
-from portfolio_data import format_portfolio_for_agent, get_portfolio_data
-from function_tools import function_tools, execute_function_tool
+from livekit.plugins import deepgram, silero
+
+from background_loop import get_background_loop
 from config import config
+from error_handler import LIVEKIT_CONNECT, LLM, STT, TTS, error_handler
+from function_tools import (
+    PortfolioSnapshot,
+    get_current_snapshot,
+)
+from instructions import build_instructions
 from logger import logger
-from error_handler import error_handler
+from loop_monitor import loop_monitor
+from metrics_exporter import MetricsServer, snapshot_publisher
+from portfolio_data import get_portfolio_data
+from portfolio_reloader import portfolio_reloader
+from prewarm import (
+    PORTFOLIO_DATA,
+    PORTFOLIO_SNAPSHOT,
+    VAD,
+    get_resource_registry,
+)
 from session_monitor import session_monitor
+from session_tool_cache import SessionToolCache
+from tool_executor import tool_executor
+from tool_prefetch import ToolPrefetcher
 
 
 class PortfolioAssistant(Agent):
-    def __init__(self, session_id: str) -> None:
+    def __init__(
+        self, session_id: str, snapshot: Optional[PortfolioSnapshot] = None
+    ) -> None:
         self.session_id = session_id
-        portfolio_data = get_portfolio_data()
-        portfolio_summary = format_portfolio_for_agent(portfolio_data)
-        super().__init__(
-            instructions=f"""
-You are a helpful voice assistant for {portfolio_data.personal.name}'s portfolio website.
-
-Act like a friendly, slightly nerdy engineering buddy who answers questions about their experience, projects, skills, and background.
-
-{portfolio_summary}
-
-Voice response guidelines:
-1) keep answers short and human, like you're chatting on a call
-2) 3–4 sentences max unless they explicitly ask for more depth
-3) if it exists in the portfolio data, use real specifics (company names, stacks, metrics)
-4) if something isn't in the portfolio data, say you don't have that info
-5) offer to expand if they want to zoom in
-6) for visuals, just point them to the site (you're not a CDN)
-7) for availability or contact, share their contact / booking info
-8) tone = chill, sharp, confident, not corporate-marketing
-
-data you can use:
-- experience at Healthtrip, AST Consulting, Microsoft
-- projects like LeetCode MCP server and ML based traffic detection
-- stacks: React, Next.js, NestJS, Python, AWS, Docker, Kubernetes
-- MSc Computing Science, University of Glasgow
-- contact + meeting scheduling info
-
-if the answer isn't in the known set → return politely with "not in my dataset" and offer to check another area.
-"""
-        )
+        # Pin one data version for the whole session, even across hot reloads
+        self.snapshot = snapshot or get_current_snapshot()
+        self.prompt = build_instructions(self.snapshot)
+        self.prefetcher = ToolPrefetcher(self.snapshot)
+        self.tool_cache = SessionToolCache()
+        session_monitor.on_session_end(session_id, self.tool_cache.release)
+        super().__init__(instructions=self.prompt.text)
 
-    @function_tool
-    async def get_experience(self, context: RunContext, company: Optional[str] = None):
-        logger.info("Getting experience information", {"company": company})
+    async def llm_node(
+        self,
+        chat_ctx: llm.ChatContext,
+        tools: List[llm.FunctionTool],
+        model_settings: ModelSettings,
+    ) -> AsyncIterable[Union[llm.ChatChunk, str]]:
+        # Answer with a canned reply instead of queueing on a failing LLM
+        if not error_handler.allow(LLM):
+            session_monitor.track_error(self.session_id, "llm_circuit_open")
+            yield error_handler.fallback_response(LLM)
+            return
+        async for chunk in Agent.default.llm_node(
+            self, chat_ctx, tools, model_settings
+        ):
+            yield chunk
+
+    async def _run_tool(
+        self, context: RunContext, function_name: str, args: dict, error_type: str
+    ) -> str:
+        """Execute a portfolio tool, recording its latency and outcome"""
+        start = time.perf_counter()
+        call_id = context.function_call.call_id
         try:
-            result = execute_function_tool("getExperience", {"company": company})
+            result = self.tool_cache.lookup(
+                function_name, args, call_id, self.chat_ctx.items
+            )
+            if result is None:
+                self.prefetcher.record_call(function_name, args)
+                result = await tool_executor.run(self.snapshot, function_name, args)
+                self.tool_cache.store(function_name, args, call_id, result)
             session_monitor.track_agent_message(self.session_id)
             return result
+        except asyncio.TimeoutError:
+            session_monitor.track_error(self.session_id, error_type)
+            return error_handler.handle_timeout_error(
+                f"tool.{function_name}", {"timeout": tool_executor.timeout}
+            )
         except Exception as e:
-            session_monitor.track_error(self.session_id, "get_experience")
-            return error_handler.handle_llm_error(e)
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_projects")
+            session_monitor.track_error(self.session_id, error_type)
             return error_handler.handle_llm_error(e)
+        finally:
+            session_monitor.track_latency(
+                self.session_id,
+                f"tool.{function_name}",
+                (time.perf_counter() - start) * 1000,
+            )
+
+    @function_tool
+    async def get_experience(self, context: RunContext, company: Optional[str] = None):
+        logger.info("Getting experience information", {"company": company})
+        return await self._run_tool(
+            context, "getExperience", {"company": company}, "get_experience"
+        )
+
+    @function_tool
+    async def get_projects(
+        self,
+        context: RunContext,
+        featured: Optional[bool] = None,
+        project_id: Optional[str] = None,
+    ):
+        logger.info(
+            "Getting project information",
+            {"featured": featured, "project_id": project_id},
+        )
+        return await self._run_tool(
+            context,
+            "getProjects",
+            {"featured": featured, "project_id": project_id},
+            "get_projects",
+        )
 
     @function_tool
     async def get_skills(self, context: RunContext, category: Optional[str] = None):
         logger.info("Getting skills information", {"category": category})
-        try:
-            result = execute_function_tool("getSkills", {"category": category})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_skills")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(
+            context, "getSkills", {"category": category}, "get_skills"
+        )
 
     @function_tool
     async def get_education(self, context: RunContext):
         logger.info("Getting education information")
-        try:
-            result = execute_function_tool("getEducation", {})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_education")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(context, "getEducation", {}, "get_education")
 
     @function_tool
     async def get_contact_info(self, context: RunContext):
         logger.info("Getting contact information")
-        try:
-            result = execute_function_tool("getContactInfo", {})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_contact_info")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(context, "getContactInfo", {}, "get_contact_info")
 
     @function_tool
     async def get_personal_info(self, context: RunContext):
         logger.info("Getting personal information")
-        try:
-            result = execute_function_tool("getPersonalInfo", {})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_personal_info")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(context, "getPersonalInfo", {}, "get_personal_info")
 
     @function_tool
     async def get_portfolio_summary(self, context: RunContext):
         logger.info("Getting portfolio summary")
-        try:
-            result = execute_function_tool("getPortfolioSummary", {})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "get_portfolio_summary")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(
+            context, "getPortfolioSummary", {}, "get_portfolio_summary"
+        )
 
     @function_tool
     async def search_portfolio(self, context: RunContext, query: str):
         logger.info("Searching portfolio", {"query": query})
-        try:
-            result = execute_function_tool("searchPortfolio", {"query": query})
-            session_monitor.track_agent_message(self.session_id)
-            return result
-        except Exception as e:
-            session_monitor.track_error(self.session_id, "search_portfolio")
-            return error_handler.handle_llm_error(e)
+        return await self._run_tool(
+            context, "searchPortfolio", {"query": query}, "search_portfolio"
+        )
+
+    @function_tool
+    async def get_more(self, context: RunContext, handle: str):
+        """Get the next part of a result that was cut short. Only call this
+        when the user asks for more, with the handle from that result."""
+        logger.info("Getting more results", {"handle": handle})
+        return await self._run_tool(context, "getMore", {"handle": handle}, "get_more")
 
 
 def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+    logger.set_level(config.LOG_LEVEL)
+    if config.LOG_ASYNC:
+        logger.enable_async(
+            max_queue_size=config.LOG_QUEUE_SIZE,
+            overflow_policy=config.LOG_OVERFLOW_POLICY,
+        )
+
+    # Job threads (JOB_EXECUTOR=thread) share one registry; only the first loads
+    resources = get_resource_registry(proc)
+    resources.ensure(VAD, silero.VAD.load)
+    resources.ensure(PORTFOLIO_DATA, get_portfolio_data)
+    resources.ensure(PORTFOLIO_SNAPSHOT, get_current_snapshot)
+    logger.info("Process prewarmed", {"load_times_ms": resources.load_times_ms})
+
+
+def _track_pipeline_metrics(session_id: str, agent_metrics: metrics.AgentMetrics):
+    """Feed STT/LLM/TTS latency and usage from a metrics event to the monitor"""
+    if isinstance(agent_metrics, metrics.LLMMetrics):
+        error_handler.record_success(LLM)
+        if agent_metrics.ttft >= 0:
+            session_monitor.track_latency(
+                session_id, "llm_ttft", agent_metrics.ttft * 1000
+            )
+        session_monitor.track_llm_usage(
+            session_id, agent_metrics.prompt_tokens, agent_metrics.completion_tokens
+        )
+    elif isinstance(agent_metrics, metrics.TTSMetrics):
+        if agent_metrics.ttfb >= 0:
+            session_monitor.track_latency(
+                session_id, "tts_ttfb", agent_metrics.ttfb * 1000
+            )
+        session_monitor.track_tts_usage(session_id, agent_metrics.characters_count)
+    elif isinstance(agent_metrics, metrics.STTMetrics):
+        session_monitor.track_stt_usage(session_id, agent_metrics.audio_duration)
+    elif isinstance(agent_metrics, metrics.EOUMetrics):
+        session_monitor.track_latency(
+            session_id,
+            "stt_transcription_delay",
+            agent_metrics.transcription_delay * 1000,
+        )
+        session_monitor.track_latency(
+            session_id,
+            "end_of_utterance_delay",
+            agent_metrics.end_of_utterance_delay * 1000,
+        )
+
+
+def _track_pipeline_error(session_id: str, error: object):
+    """Count an STT/LLM/TTS failure; LLM failures also trip its circuit breaker"""
+    if isinstance(error, stt.STTError):
+        dependency = STT
+    elif isinstance(error, llm.LLMError):
+        dependency = LLM
+    elif isinstance(error, tts.TTSError):
+        dependency = TTS
+    else:
+        return
+    context = {"session_id": session_id, "recoverable": error.recoverable}
+    session_monitor.track_error(session_id, f"{dependency}_error")
+    if dependency == STT:
+        error_handler.handle_stt_error(error.error, context)
+    elif dependency == LLM:
+        error_handler.handle_llm_error(error.error, context)
+    else:
+        error_handler.handle_tts_error(error.error, "", context)
+    if dependency in error_handler.breakers:
+        error_handler.record_failure(dependency, error.error)
 
 
 async def entrypoint(ctx: JobContext):
+    job_start = time.perf_counter()
     ctx.log_context_fields = {
         "room": ctx.room.name,
     }
 
-    session_id = ctx.room.name
+    resources = get_resource_registry(ctx.proc)
+    vad_prewarmed = VAD in resources
+
+    # Unique per job, even when several jobs in one process share a room name
+    session_id = ctx.job.id
     session_monitor.start_session(session_id, ctx.room.name)
+    if config.METRICS_ENABLED:
+        snapshot_publisher.ensure_started()
+    if config.LOOP_MONITOR_ENABLED:
+        loop_monitor.ensure_started()
+    if config.PORTFOLIO_RELOAD_ENABLED:
+        portfolio_reloader.ensure_started()
+
+    snapshot = get_current_snapshot()
+    assistant = PortfolioAssistant(session_id, snapshot)
+    logger.info(
+        "Agent instructions",
+        {
+            "session_id": session_id,
+            "prefix_hash": assistant.prompt.prefix_hash,
+            "data_version": assistant.prompt.data_version,
+            "length": len(assistant.prompt.text),
+        },
+    )
 
     session = AgentSession(
         stt=deepgram.STTv2(
@@ -162,16 +293,43 @@ async def entrypoint(ctx: JobContext):
             model="aura-asteria-en",
         ),
         turn_detection="vad",
-        vad=silero.VAD.load(),
+        vad=resources.get(VAD, silero.VAD.load),
         preemptive_generation=True,
     )
 
     usage_collector = metrics.UsageCollector()
+    first_audio_logged = False
+
+    @session.on("agent_state_changed")
+    def _on_agent_state_changed(ev: AgentStateChangedEvent):
+        nonlocal first_audio_logged
+        if first_audio_logged or ev.new_state != "speaking":
+            return
+        first_audio_logged = True
+        logger.info(
+            "Time to first audio",
+            {
+                "session_id": session_id,
+                "time_to_first_audio_ms": (time.perf_counter() - job_start) * 1000,
+                "vad_prewarmed": vad_prewarmed,
+            },
+        )
+
+    if config.TOOL_PREFETCH_ENABLED:
+
+        @session.on("user_input_transcribed")
+        def _on_user_input_transcribed(ev: UserInputTranscribedEvent):
+            assistant.prefetcher.on_transcript(ev.transcript)
+
+    @session.on("error")
+    def _on_error(ev: ErrorEvent):
+        _track_pipeline_error(session_id, ev.error)
 
     @session.on("metrics_collected")
     def _on_metrics_collected(ev: MetricsCollectedEvent):
         metrics.log_metrics(ev.metrics)
         usage_collector.collect(ev.metrics)
+        _track_pipeline_metrics(session_id, ev.metrics)
 
     async def log_usage():
         summary = usage_collector.get_summary()
@@ -180,25 +338,104 @@ async def entrypoint(ctx: JobContext):
         except Exception:
             summary_dict = str(summary)
         logger.info("Usage summary", {"summary": summary_dict})
+        logger.info(
+            "Tool prefetch summary",
+            {"session_id": session_id, **assistant.prefetcher.stats()},
+        )
+        logger.info(
+            "Session tool cache summary",
+            {"session_id": session_id, **assistant.tool_cache.stats()},
+        )
         session_monitor.end_session(session_id, status="completed")
+        if config.METRICS_ENABLED:
+            await snapshot_publisher.publish()
+        if config.PORTFOLIO_RELOAD_ENABLED and not _threaded_jobs():
+            # The job process exits with this job; close the API session first
+            await portfolio_reloader.stop()
 
     ctx.add_shutdown_callback(log_usage)
 
     try:
         await session.start(
-            agent=PortfolioAssistant(session_id),
+            agent=assistant,
             room=ctx.room,
             room_input_options=RoomInputOptions(),
         )
+    except Exception:
+        # Nothing to retry into without a session; fail the job
+        session_monitor.track_error(session_id, "session_start")
+        raise
+
+    try:
         await ctx.connect()
-        logger.info("Successfully connected to room", {"room": ctx.room.name})
     except Exception as e:
-        session_monitor.track_error(session_id, "session_start")
-        error_handler.handle_connection_error(e, lambda: None)
+        session_monitor.track_error(session_id, "room_connect")
+        if not await error_handler.handle_connection_error(
+            e, ctx.connect, {"session_id": session_id}
+        ):
+            raise
+        logger.info("Reconnected to room", {"room": ctx.room.name})
+    else:
+        error_handler.record_success(LIVEKIT_CONNECT)
+        logger.info("Successfully connected to room", {"room": ctx.room.name})
+
+
+# Seconds to wait for process-wide tasks to stop at exit
+PROCESS_TASK_STOP_TIMEOUT = 5.0
+
+
+def _session_load(*_args) -> float:
+    """Worker load as a fraction of MAX_SESSIONS_PER_PROCESS"""
+    return len(session_monitor.sessions) / config.MAX_SESSIONS_PER_PROCESS
+
+
+def _threaded_jobs() -> bool:
+    return JobExecutorType(config.JOB_EXECUTOR) is JobExecutorType.THREAD
+
+
+def _job_executor_options() -> dict:
+    """WorkerOptions for JOB_EXECUTOR: process (default) or thread"""
+    if not _threaded_jobs():
+        return {}
+    options = {"job_executor_type": JobExecutorType.THREAD}
+    if config.MAX_SESSIONS_PER_PROCESS > 0:
+        options["load_fnc"] = _session_load
+        options["load_threshold"] = 1.0
+    return options
+
+
+def _start_process_tasks():
+    """
+    With JOB_EXECUTOR=thread, each job's loop closes when the job ends, so
+    process-wide tasks run on the background loop instead
+    """
+    if not _threaded_jobs():
+        return
+    loop = get_background_loop()
+    if config.METRICS_ENABLED:
+        snapshot_publisher.ensure_started(loop)
+    if config.PORTFOLIO_RELOAD_ENABLED:
+        portfolio_reloader.ensure_started(loop)
+        atexit.register(_stop_reloader, loop)
+
+
+def _stop_reloader(loop: asyncio.AbstractEventLoop):
+    asyncio.run_coroutine_threadsafe(portfolio_reloader.stop(), loop).result(
+        PROCESS_TASK_STOP_TIMEOUT
+    )
 
 
 if __name__ == "__main__":
-    if not "download-files" in sys.argv:
+    if "download-files" not in sys.argv:
         config.validate()
+        if config.METRICS_ENABLED:
+            MetricsServer(
+                config.PORT, config.METRICS_DIR, config.METRICS_SNAPSHOT_INTERVAL
+            ).start()
+        _start_process_tasks()
 
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
+    cli.run_app(
+        WorkerOptions(
+            entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, **_job_executor_options()
+        )
+    )
@@ -0,0 +1,29 @@
+"""
+Process-wide event loop for background tasks.
+
+With JOB_EXECUTOR=thread, jobs share the worker process, but each one runs
+on its own event loop in its own thread. When a job ends, its loop is
+closed and its tasks are cancelled. Process-wide tasks therefore run on
+this loop instead, so they outlive any single job. These are portfolio
+hot reload and metrics snapshot publishing.
+"""
+
+import asyncio
+import threading
+from typing import Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Start the background loop's thread on first use and return the loop"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="background-loop", daemon=True
+            ).start()
+            _loop = loop
+    return _loop
@@ -0,0 +1,134 @@
+"""
+Circuit breakers, retry budgets and backoff for external dependencies.
+
+One breaker per dependency (LLM, LiveKit connect) is shared by every
+session in the process, so when a provider degrades the first few
+failures open the circuit and later sessions fail fast to a canned
+response instead of each piling up its own slow failing calls. After the
+recovery timeout a limited number of probe calls are let through; a
+success closes the circuit again, a failure re-opens it. A probe whose
+outcome is never recorded (a generation cancelled by an interruption)
+expires after another recovery timeout, so new probes are let through.
+"""
+
+import random
+import time
+from typing import Optional
+
+from error_rates import SlidingWindowCounter
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    rng: Optional[random.Random] = None,
+) -> float:
+    """
+    Exponential backoff with full jitter
+    @param attempt Retry attempt, starting at 1
+    @returns Seconds to wait, uniformly drawn from [0, min(max, base * 2^(attempt-1))]
+    """
+    ceiling = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return (rng or random).uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.open_count = 0
+        self._half_open_calls = 0
+        self._probes_started_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        """Whether a call may go to the dependency right now"""
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == STATE_OPEN:
+            assert self.opened_at is not None
+            if now - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = STATE_HALF_OPEN
+            self._half_open_calls = 0
+        elif (
+            self._probes_started_at is not None
+            and now - self._probes_started_at >= self.recovery_timeout
+        ):
+            # No outcome was recorded for the last probes; let new ones through
+            self._half_open_calls = 0
+        if self._half_open_calls < self.half_open_max_calls:
+            if self._half_open_calls == 0:
+                self._probes_started_at = now
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def record_success(self) -> bool:
+        """Record a successful call; returns True if this closed the circuit"""
+        self.consecutive_failures = 0
+        if self.state == STATE_CLOSED:
+            return False
+        self.state = STATE_CLOSED
+        self.opened_at = None
+        return True
+
+    def record_failure(self) -> bool:
+        """Record a failed call; returns True if this opened the circuit"""
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = STATE_OPEN
+            self.opened_at = time.monotonic()
+            self.open_count += 1
+            return True
+        return False
+
+    def to_dict(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+        }
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent calls, plus a small floor, so
+    retries cannot multiply load on a dependency that is already failing
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 3, window: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        # Trailing windows, so the budget does not refill all at once
+        self._calls = SlidingWindowCounter(window, bucket_seconds=window / 12)
+        self._retries = SlidingWindowCounter(window, bucket_seconds=window / 12)
+
+    def record_call(self):
+        self._calls.add()
+
+    def try_acquire(self) -> bool:
+        """Take one retry from the budget if any is left"""
+        if self._retries.count() < self.min_retries + self.ratio * self._calls.count():
+            self._retries.add()
+            return True
+        return False
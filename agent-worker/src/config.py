@@ -4,8 +4,9 @@ Mirrors src_bak/config.ts functionality.
 """
 
 import os
+import tempfile
+
 from dotenv import load_dotenv
-from typing import Optional
 
 # Try to load from .env.local first, then fall back to .env
 env_local_path = os.path.join(os.path.dirname(__file__), "..", ".env.local")
@@ -33,7 +34,67 @@ class Config:
         self.ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
         self.NODE_ENV = os.getenv("NODE_ENV", "development")
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "info")
+        self.LOG_ASYNC = os.getenv("LOG_ASYNC", "false").lower() == "true"
+        self.LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        self.LOG_OVERFLOW_POLICY = os.getenv("LOG_OVERFLOW_POLICY", "drop")
         self.PORT = int(os.getenv("PORT", "3001"))
+        self.PORTFOLIO_API_URL = os.getenv("PORTFOLIO_API_URL")
+        self.PORTFOLIO_API_TIMEOUT = float(os.getenv("PORTFOLIO_API_TIMEOUT", "2"))
+        self.PORTFOLIO_API_POLL_INTERVAL = float(
+            os.getenv("PORTFOLIO_API_POLL_INTERVAL", "60")
+        )
+        self.PORTFOLIO_RELOAD_ENABLED = (
+            os.getenv("PORTFOLIO_RELOAD_ENABLED", "true").lower() == "true"
+        )
+        self.PORTFOLIO_RELOAD_INTERVAL = float(
+            os.getenv("PORTFOLIO_RELOAD_INTERVAL", "5")
+        )
+        self.TOOL_PREFETCH_ENABLED = (
+            os.getenv("TOOL_PREFETCH_ENABLED", "true").lower() == "true"
+        )
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+        self.METRICS_DIR = os.getenv(
+            "METRICS_DIR",
+            os.path.join(tempfile.gettempdir(), "portfolio-agent-metrics"),
+        )
+        self.METRICS_SNAPSHOT_INTERVAL = float(
+            os.getenv("METRICS_SNAPSHOT_INTERVAL", "5")
+        )
+        # "process": one job per process; "thread": jobs share the worker
+        # process, and its snapshot, caches and prewarmed models
+        self.JOB_EXECUTOR = os.getenv("JOB_EXECUTOR", "process")
+        # With JOB_EXECUTOR=thread, stop taking jobs at this many sessions
+        # (0 = LiveKit's default CPU-based load)
+        self.MAX_SESSIONS_PER_PROCESS = int(os.getenv("MAX_SESSIONS_PER_PROCESS", "0"))
+        self.TOOL_EXECUTOR = os.getenv("TOOL_EXECUTOR", "thread")
+        self.TOOL_EXECUTOR_WORKERS = int(os.getenv("TOOL_EXECUTOR_WORKERS", "2"))
+        self.TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "5"))
+        # "voice" ranks and pages list-style tool output to a token budget;
+        # "full" returns every item in full
+        self.TOOL_OUTPUT_MODE = os.getenv("TOOL_OUTPUT_MODE", "voice")
+        self.TOOL_TOKEN_BUDGET = int(os.getenv("TOOL_TOKEN_BUDGET", "300"))
+        self.TOOL_TOP_ACHIEVEMENTS = int(os.getenv("TOOL_TOP_ACHIEVEMENTS", "3"))
+        self.CIRCUIT_FAILURE_THRESHOLD = int(
+            os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")
+        )
+        self.CIRCUIT_RECOVERY_TIMEOUT = float(
+            os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "30")
+        )
+        self.RETRY_BUDGET_RATIO = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+        self.RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+        self.RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+        self.CONNECT_MAX_ATTEMPTS = int(os.getenv("CONNECT_MAX_ATTEMPTS", "4"))
+        self.LOOP_MONITOR_ENABLED = (
+            os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+        )
+        self.LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "50"))
+        self.LOOP_LAG_SAMPLE_INTERVAL = float(
+            os.getenv("LOOP_LAG_SAMPLE_INTERVAL", "0.05")
+        )
+        self.SESSION_HISTORY_SIZE = int(os.getenv("SESSION_HISTORY_SIZE", "100"))
+        self.SESSION_HISTORY_MAX_AGE = float(
+            os.getenv("SESSION_HISTORY_MAX_AGE", "3600")
+        )
 
     def validate(self):
         missing = []
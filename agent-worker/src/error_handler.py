@@ -3,8 +3,28 @@ Centralized error handler for agent worker.
 Mirrors src_bak/error-handler.ts functionality.
 """
 
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from circuit_breaker import CircuitBreaker, RetryBudget, backoff_delay
+from config import config
+from error_rates import ErrorRates
 from logger import logger
-from typing import Optional, Dict
+
+STT = "stt"
+LLM = "llm"
+TTS = "tts"
+LIVEKIT_CONNECT = "livekit_connect"
+# Dependencies with a circuit breaker: calls to them are skipped while it is
+# open. STT and TTS errors are only counted; there is no fallback voice path.
+DEPENDENCIES = (LLM, LIVEKIT_CONNECT)
+
+# Spoken instead of calling a dependency whose circuit is open
+CANNED_RESPONSES = {
+    LLM: "I'm having some technical trouble right now. Give me a minute and ask me again.",
+    LIVEKIT_CONNECT: "I'm having trouble connecting right now.",
+}
 
 
 class AgentError(Exception):
@@ -25,8 +45,50 @@ class AgentError(Exception):
 
 class ErrorHandler:
     def __init__(self):
-        self.error_counts = {}
-        self.last_errors = {}
+        self.error_rates = ErrorRates()
+        # Shared by every session in the process
+        self.breakers = {
+            dependency: CircuitBreaker(
+                dependency,
+                failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                recovery_timeout=config.CIRCUIT_RECOVERY_TIMEOUT,
+            )
+            for dependency in DEPENDENCIES
+        }
+        self.retry_budgets = {
+            dependency: RetryBudget(ratio=config.RETRY_BUDGET_RATIO)
+            for dependency in DEPENDENCIES
+        }
+
+    def error_rate(self, error_type: str, window: float = 60.0) -> float:
+        """Errors of this type per second over the trailing window"""
+        return self.error_rates.rate(error_type, window)
+
+    def allow(self, dependency: str) -> bool:
+        """Whether a call to the dependency should be attempted right now"""
+        return self.breakers[dependency].allow()
+
+    def fallback_response(self, dependency: str) -> str:
+        return CANNED_RESPONSES[dependency]
+
+    def record_success(self, dependency: str):
+        self.retry_budgets[dependency].record_call()
+        if self.breakers[dependency].record_success():
+            logger.info("Circuit closed", {"dependency": dependency})
+
+    def record_failure(self, dependency: str, error: Optional[Exception] = None):
+        self.retry_budgets[dependency].record_call()
+        breaker = self.breakers[dependency]
+        if breaker.record_failure():
+            logger.warn(
+                "Circuit opened",
+                {
+                    "dependency": dependency,
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "recovery_timeout": breaker.recovery_timeout,
+                    "error": str(error) if error else None,
+                },
+            )
 
     def handle_stt_error(self, error: Exception, context: Optional[Dict] = None) -> str:
         agent_error = AgentError(
@@ -42,7 +104,7 @@ class ErrorHandler:
         )
         logger.error(agent_error.args[0], context)
         self._increment("llm_error")
-        if "rate limit" in str(error) or "429" in str(error):
+        if _is_rate_limited(error):
             return (
                 "I'm experiencing high demand right now. Please try again in a moment."
             )
@@ -59,15 +121,57 @@ class ErrorHandler:
         )
         self._increment("tts_error")
 
-    def handle_connection_error(
-        self, error: Exception, reconnect_callback, context: Optional[Dict] = None
-    ):
+    async def handle_connection_error(
+        self,
+        error: Exception,
+        reconnect_callback: Callable[[], Union[Awaitable[Any], Any]],
+        context: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Log a connection failure and retry it with backoff while the
+        LiveKit connect circuit and retry budget allow
+        @param reconnect_callback Re-attempts the connection; may be async
+        @returns True if a retry reconnected
+        """
         agent_error = AgentError(
             f"Connection error: {error}", "connection_error", "high", True, context
         )
         logger.error(agent_error.args[0], context)
         self._increment("connection_error")
-        # Implement retry logic if needed
+        self.record_failure(LIVEKIT_CONNECT, error)
+
+        budget = self.retry_budgets[LIVEKIT_CONNECT]
+        for attempt in range(1, config.CONNECT_MAX_ATTEMPTS + 1):
+            if not self.allow(LIVEKIT_CONNECT) or not budget.try_acquire():
+                logger.warn(
+                    "Not retrying connection",
+                    {
+                        **(context or {}),
+                        "circuit": self.breakers[LIVEKIT_CONNECT].state,
+                        "attempt": attempt,
+                    },
+                )
+                return False
+
+            delay = backoff_delay(
+                attempt, config.RETRY_BASE_DELAY, config.RETRY_MAX_DELAY
+            )
+            logger.info(
+                "Retrying connection",
+                {**(context or {}), "attempt": attempt, "delay": round(delay, 3)},
+            )
+            await asyncio.sleep(delay)
+            try:
+                result = reconnect_callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as retry_error:
+                self._increment("connection_error")
+                self.record_failure(LIVEKIT_CONNECT, retry_error)
+                continue
+            self.record_success(LIVEKIT_CONNECT)
+            return True
+        return False
 
     def handle_timeout_error(
         self, operation: str, context: Optional[Dict] = None
@@ -80,10 +184,14 @@ class ErrorHandler:
         return "I'm taking a bit longer than usual. Let me try that again."
 
     def _increment(self, error_type: str):
-        self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
-        from datetime import datetime
+        self.error_rates.record(error_type)
+
 
-        self.last_errors[error_type] = datetime.utcnow().isoformat()
+def _is_rate_limited(error: Exception) -> bool:
+    if getattr(error, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "429" in message
 
 
 error_handler = ErrorHandler()
@@ -0,0 +1,107 @@
+"""
+Sliding-window error counters for agent worker metrics.
+
+Each counter is a ring of fixed time buckets, so memory per error type is
+constant and recording an error is O(1): the bucket for the current time
+is reset if it still holds an older period, then incremented. Counts over
+the trailing 1m, 5m and 15m windows are summed from the ring on read, to
+tell a burst from background noise. Windows are accurate to one bucket.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Reported windows, in seconds
+WINDOWS = {"1m": 60.0, "5m": 300.0, "15m": 900.0}
+BUCKET_SECONDS = 10.0
+
+
+class SlidingWindowCounter:
+    __slots__ = ("_counts", "_periods", "bucket_seconds")
+
+    def __init__(self, window: float, bucket_seconds: float = BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        size = max(1, math.ceil(window / bucket_seconds))
+        self._counts: List[int] = [0] * size
+        self._periods: List[int] = [-1] * size
+
+    @property
+    def window(self) -> float:
+        return len(self._counts) * self.bucket_seconds
+
+    def _period(self, now: Optional[float]) -> int:
+        return int((time.monotonic() if now is None else now) // self.bucket_seconds)
+
+    def add(self, amount: int = 1, now: Optional[float] = None):
+        period = self._period(now)
+        index = period % len(self._counts)
+        if self._periods[index] != period:
+            self._periods[index] = period
+            self._counts[index] = 0
+        self._counts[index] += amount
+
+    def count(self, window: Optional[float] = None, now: Optional[float] = None) -> int:
+        """
+        Events in the trailing window
+        @param window Seconds, up to the counter's own window (default: all of it)
+        """
+        buckets = len(self._counts)
+        if window is not None:
+            buckets = min(buckets, max(1, math.ceil(window / self.bucket_seconds)))
+        oldest = self._period(now) - buckets + 1
+        return sum(
+            count
+            for count, period in zip(self._counts, self._periods)
+            if period >= oldest
+        )
+
+
+class ErrorRates:
+    """Per-type error counters: lifetime totals plus trailing-window rates"""
+
+    def __init__(self, bucket_seconds: float = BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        self.totals: Dict[str, int] = {}
+        self.last_occurrence: Dict[str, str] = {}
+        self._windows: Dict[str, SlidingWindowCounter] = {}
+        # Jobs sharing the process record errors from their own threads
+        self._lock = threading.Lock()
+
+    def record(self, error_type: str, now: Optional[float] = None):
+        with self._lock:
+            counter = self._windows.get(error_type)
+            if counter is None:
+                counter = self._windows[error_type] = SlidingWindowCounter(
+                    max(WINDOWS.values()), self.bucket_seconds
+                )
+            counter.add(1, now)
+            self.totals[error_type] = self.totals.get(error_type, 0) + 1
+            self.last_occurrence[error_type] = datetime.utcnow().isoformat()
+
+    def count(self, error_type: str, window: float, now: Optional[float] = None) -> int:
+        counter = self._windows.get(error_type)
+        return counter.count(window, now) if counter else 0
+
+    def rate(
+        self, error_type: str, window: float, now: Optional[float] = None
+    ) -> float:
+        """Errors per second over the trailing window"""
+        return self.count(error_type, window, now) / window
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        with self._lock:
+            totals = sorted(self.totals.items())
+        return {
+            error_type: {
+                "count": total,
+                "last_occurrence": self.last_occurrence[error_type],
+                "rates": {
+                    name: round(self.rate(error_type, window, now), 4)
+                    for name, window in WINDOWS.items()
+                },
+            }
+            for error_type, total in totals
+        }
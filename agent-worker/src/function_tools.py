@@ -6,36 +6,332 @@ when answering user questions. Each tool is designed to be called by the LLM
 when it needs specific data to formulate a response.
 """
 
-from typing import Dict, List, Any, Optional
+import asyncio
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import config
+from fuzzy_index import COMPACT_MATCH_SCORE, FuzzyIndex, FuzzyMatch
 from portfolio_data import (
-    get_portfolio_data,
-    PortfolioConfig,
+    Education,
     Experience,
+    PortfolioConfig,
     Project,
     Skill,
-    Education,
+    get_portfolio_data,
+    set_portfolio_data,
 )
+from search_index import SearchIndex
+from voice_output import (
+    NO_MORE_RESULTS,
+    OUTPUT_VOICE,
+    decode_handle,
+    encode_handle,
+    iter_pages,
+    top_achievements,
+)
+
+SKILL_CATEGORIES = ["frontend", "backend", "tools", "other"]
+
+# Parameters whose handlers match case-insensitively share one cache entry
+_CASE_INSENSITIVE_PARAMS = {"company", "category", "query"}
+
+# Upper bound on memoized responses; the least recently used entry is evicted
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# Technologies listed per item in voice output
+VOICE_TECHNOLOGIES = 6
+
+# Tools whose cost grows with the portfolio (ranking, large formatting);
+# tool_executor may run these off the event loop
+HEAVY_FUNCTIONS = frozenset({"searchPortfolio"})
+
+ResponseCacheKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+def _normalize_args(args: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """Normalize tool arguments into a hashable cache key component"""
+    normalized = []
+    for key, value in args.items():
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+            if key in _CASE_INSENSITIVE_PARAMS:
+                value = value.lower()
+        normalized.append((key, value))
+    return tuple(sorted(normalized))
+
+
+def _closest_match_note(query: str, match: FuzzyMatch[Any], name: str) -> str:
+    """
+    Tell the LLM that a similar name stands in for the one asked about
+    @param query Name as passed to the tool
+    @param match Fuzzy lookup result used instead
+    @param name Display name of the matched item
+    @returns A leading note, or "" when only spacing or case differed
+    """
+    if match.score >= COMPACT_MATCH_SCORE:
+        return ""
+    return f"No exact match for '{query}'; closest: {name}\n\n"
 
 
 class PortfolioDataProvider:
     """Portfolio Data Provider for Voice Agent"""
 
-    def __init__(self):
-        self.data: PortfolioConfig = get_portfolio_data()
+    def __init__(
+        self,
+        data: Optional[PortfolioConfig] = None,
+        output_mode: Optional[str] = None,
+        token_budget: Optional[int] = None,
+    ):
+        self.data: PortfolioConfig = data or get_portfolio_data()
+        self.output_mode = output_mode or config.TOOL_OUTPUT_MODE
+        self.token_budget = token_budget or config.TOOL_TOKEN_BUDGET
+        self._response_cache: "OrderedDict[ResponseCacheKey, str]" = OrderedDict()
+        # Tool calls may render on tool_executor threads and other jobs' threads
+        self._response_cache_lock = threading.Lock()
+        self._rebuild_derived_state()
+
+    def _rebuild_derived_state(self):
+        """Rebuild the search index and response cache from self.data"""
+        self._search_index = self._build_search_index()
+        self._build_lookup_indexes()
+        self._response_cache = OrderedDict()
+        self._warm_response_cache()
+
+    def _warm_response_cache(self):
+        """Pre-render responses for every no-arg and enum-arg tool call"""
+        warm_calls: List[Tuple[str, Dict[str, Any], Callable[[], str]]] = [
+            ("getExperience", {}, self.get_experience_summary),
+            ("getProjects", {}, self.get_project_details),
+            ("getSkills", {}, self.get_skills_by_category),
+            ("getEducation", {}, self.get_education_summary),
+            ("getContactInfo", {}, self.get_contact_info),
+            ("getPersonalInfo", {}, self.get_personal_info),
+            ("getPortfolioSummary", {}, self.get_portfolio_summary),
+        ]
+
+        for featured in (True, False):
+            warm_calls.append(
+                (
+                    "getProjects",
+                    {"featured": featured},
+                    partial(self.get_project_details, featured),
+                )
+            )
+
+        for category in SKILL_CATEGORIES:
+            warm_calls.append(
+                (
+                    "getSkills",
+                    {"category": category},
+                    partial(self.get_skills_by_category, category),
+                )
+            )
+
+        for exp in self.data.experience:
+            warm_calls.append(
+                (
+                    "getExperience",
+                    {"company": exp.company},
+                    partial(self.get_experience_summary, exp.company),
+                )
+            )
+
+        for function_name, args, render in warm_calls:
+            self._response_cache[(function_name, _normalize_args(args))] = render()
 
-    def get_experience_summary(self, company: Optional[str] = None) -> str:
+    def get_cached_response(
+        self, function_name: str, args: Dict[str, Any], render: Callable[[], str]
+    ) -> str:
+        """
+        Return a memoized tool response, rendering and storing it on a miss
+        @param function_name Name of the tool being called
+        @param args Tool arguments, normalized into the cache key
+        @param render Produces the response when it is not cached yet
+        @returns Formatted tool response
+        """
+        key = self.cache_key(function_name, args)
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                return cached
+
+        response = render()
+        with self._response_cache_lock:
+            self._response_cache[key] = response
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > RESPONSE_CACHE_MAX_ENTRIES:
+                self._response_cache.popitem(last=False)
+        return response
+
+    def peek_cached_response(
+        self, function_name: str, args: Dict[str, Any]
+    ) -> Optional[str]:
+        """Return a memoized tool response without rendering on a miss"""
+        with self._response_cache_lock:
+            return self._response_cache.get(self.cache_key(function_name, args))
+
+    def cache_key(self, function_name: str, args: Dict[str, Any]) -> ResponseCacheKey:
+        """
+        Response cache key of a tool call on this provider's data
+        @param function_name Name of the tool
+        @param args Tool arguments; a project title is keyed as the project's id
+        @returns Key shared by every spelling of the same call
+        """
+        args = {_param_aliases.get(key, key): value for key, value in args.items()}
+        project_id = args.get("project_id")
+        if function_name == "getProjects" and isinstance(project_id, str):
+            # Only exact names: a fuzzy match is answered with a notice
+            project = self._project_index.exact(project_id)
+            if project is not None:
+                args["project_id"] = project.id
+        return tool_cache_key(function_name, args)
+
+    def _build_search_index(self) -> SearchIndex:
+        """Tokenize experience, projects and skills into a ranked index"""
+        index = SearchIndex()
+
+        for exp in self.data.experience:
+            index.add_document(
+                exp,
+                [
+                    (exp.company, 3.0),
+                    (exp.position, 2.0),
+                    (exp.description, 1.0),
+                    (" ".join(exp.achievements), 1.0),
+                    (" ".join(exp.technologies), 2.0),
+                ],
+            )
+
+        for project in self.data.projects:
+            index.add_document(
+                project,
+                [
+                    (project.title, 3.0),
+                    (project.description, 1.0),
+                    (" ".join(project.technologies), 2.0),
+                    (" ".join(project.tags or []), 1.0),
+                ],
+            )
+
+        for skill in self.data.skills:
+            index.add_document(skill, [(skill.name, 3.0)])
+
+        return index.build()
+
+    def _build_lookup_indexes(self):
+        """Index names the LLM passes back from transcripts, for fuzzy lookup"""
+        self._company_index: FuzzyIndex[str] = FuzzyIndex()
+        for exp in self.data.experience:
+            self._company_index.add(exp.company, exp.company)
+        self._company_index.build()
+
+        self._project_index: FuzzyIndex[Project] = FuzzyIndex()
+        for project in self.data.projects:
+            self._project_index.add(project.id, project)
+            self._project_index.add(project.title, project)
+        self._project_index.build()
+
+        # Any name the search index knows as a document title
+        self._name_index: FuzzyIndex[str] = FuzzyIndex()
+        for skill in self.data.skills:
+            self._name_index.add(skill.name, skill.name)
+        for exp in self.data.experience:
+            self._name_index.add(exp.company, exp.company)
+        for project in self.data.projects:
+            self._name_index.add(project.title, project.title)
+        self._name_index.build()
+
+    def _render_page(
+        self,
+        function_name: str,
+        args: Dict[str, Any],
+        blocks: Iterable[str],
+        total: int,
+        page: int,
+    ) -> str:
+        """
+        Render one budget-sized page of voice blocks, with a continuation handle
+        @param function_name Tool the blocks came from, for the handle
+        @param args Provider arguments that reproduce the blocks
+        @param blocks Brief renderings, most relevant first; only those up to
+        the requested page (and one more) are rendered
+        @param total Number of blocks, counted without rendering them
+        @param page 1-based page number
+        """
+        shown = 0
+        for number, blocks_on_page in enumerate(
+            iter_pages(blocks, self.token_budget), 1
+        ):
+            shown += len(blocks_on_page)
+            if number == page:
+                break
+        else:
+            return NO_MORE_RESULTS
+
+        text = "\n\n".join(blocks_on_page)
+        remaining = total - shown
+        if remaining:
+            handle = encode_handle(function_name, args, page + 1)
+            text += (
+                f"\n\n({remaining} more not shown. Only if asked for more, "
+                f"call getMore with handle: {handle})"
+            )
+        return text
+
+    def get_more(self, handle: str) -> str:
+        """
+        Get the next page of a tool result that was cut to the token budget
+        @param handle Continuation handle from the end of the previous page
+        @returns The requested page
+        """
+        decoded = decode_handle(handle, _BOOLEAN_PARAMS)
+        if decoded is None:
+            return f"Invalid continuation handle: {handle}"
+
+        function_name, args, page = decoded
+        if function_name == "getExperience":
+            return self.get_experience_summary(args.get("company"), page)
+        if function_name == "getProjects":
+            return self.get_project_details(
+                args.get("featured"), args.get("project_id"), page
+            )
+        if function_name == "searchPortfolio" and args.get("query"):
+            return self.search_portfolio(args["query"], page)
+        return f"Invalid continuation handle: {handle}"
+
+    def get_experience_summary(
+        self, company: Optional[str] = None, page: int = 1
+    ) -> str:
         """
         Get formatted summary of work experience
         @param company Optional company name to filter by
+        @param page Page of voice output to return
         @returns Formatted experience summary
         """
         experiences = self.data.experience
+        note = ""
 
         # Filter by company if specified
         if company:
             experiences = [
                 exp for exp in experiences if company.lower() in exp.company.lower()
             ]
+            if not experiences:
+                match = self._company_index.lookup(company)
+                if match:
+                    note = _closest_match_note(company, match, match.value)
+                    experiences = [
+                        exp
+                        for exp in self.data.experience
+                        if exp.company == match.value
+                    ]
 
         if not experiences:
             return (
@@ -44,16 +340,29 @@ class PortfolioDataProvider:
                 else "No experience information available."
             )
 
-        return "\n\n".join(self._format_experience(exp) for exp in experiences)
+        if self.output_mode == OUTPUT_VOICE:
+            text = self._render_page(
+                "getExperience",
+                {"company": company},
+                (self._format_experience_brief(exp) for exp in experiences),
+                len(experiences),
+                page,
+            )
+        else:
+            text = "\n\n".join(self._format_experience(exp) for exp in experiences)
+        return text if text == NO_MORE_RESULTS else note + text
 
-    def _format_experience(self, exp: Experience) -> str:
-        """Format a single experience entry"""
-        period = (
+    def _experience_period(self, exp: Experience) -> str:
+        return (
             f"{exp.start_date} - Present"
             if exp.current
             else f"{exp.start_date} - {exp.end_date}"
         )
 
+    def _format_experience(self, exp: Experience) -> str:
+        """Format a single experience entry"""
+        period = self._experience_period(exp)
+
         achievements = "\n".join(
             f"  {i + 1}. {achievement}"
             for i, achievement in enumerate(exp.achievements)
@@ -69,22 +378,48 @@ Period: {period}
 Key Achievements:
 {achievements}
 
+Technologies: {technologies}"""
+
+    def _format_experience_brief(self, exp: Experience) -> str:
+        """Format an experience entry for voice: top achievements only"""
+        achievements = "\n".join(
+            f"  - {achievement}"
+            for achievement in top_achievements(
+                exp.achievements, config.TOOL_TOP_ACHIEVEMENTS
+            )
+        )
+        technologies = ", ".join(exp.technologies[:VOICE_TECHNOLOGIES])
+        return f"""{exp.position} at {exp.company} ({self._experience_period(exp)})
+{exp.description}
+Top achievements:
+{achievements}
 Technologies: {technologies}"""
 
     def get_project_details(
-        self, featured: Optional[bool] = None, project_id: Optional[str] = None
+        self,
+        featured: Optional[bool] = None,
+        project_id: Optional[str] = None,
+        page: int = 1,
     ) -> str:
         """
         Get formatted project details
         @param featured If true, only return featured projects
         @param project_id Optional project ID to get specific project
+        @param page Page of voice output to return
         @returns Formatted project details
         """
         projects = self.data.projects
+        note = ""
 
         # Filter by project ID if specified
         if project_id:
             projects = [p for p in projects if p.id == project_id]
+            if not projects:
+                # The LLM often passes a (misheard) title instead of the id
+                match = self._project_index.lookup(project_id)
+                if match:
+                    note = _closest_match_note(project_id, match, match.value.title)
+                    projects = [match.value]
         elif featured:
             # Filter featured projects if requested
             projects = [p for p in projects if p.featured]
@@ -94,7 +429,21 @@ Technologies: {technologies}"""
                 return f"No project found with ID: {project_id}"
             return "No projects available."
 
-        return "\n\n".join(self._format_project(project) for project in projects)
+        if self.output_mode == OUTPUT_VOICE:
+            # Featured and most-starred projects are the ones worth mentioning
+            ranked = sorted(
+                projects, key=lambda p: (not p.featured, -(p.stargazer_count or 0))
+            )
+            text = self._render_page(
+                "getProjects",
+                {"featured": featured, "project_id": project_id},
+                (self._format_project_brief(project) for project in ranked),
+                len(ranked),
+                page,
+            )
+        else:
+            text = "\n\n".join(self._format_project(project) for project in projects)
+        return text if text == NO_MORE_RESULTS else note + text
 
     def _format_project(self, project: Project) -> str:
         """Format a single project entry"""
@@ -118,6 +467,15 @@ Technologies: {technologies}"""
 
 Technologies: {technologies}{links_section}{stats}"""
 
+    def _format_project_brief(self, project: Project) -> str:
+        """Format a project for voice: no stats, leading technologies only"""
+        technologies = ", ".join(project.technologies[:VOICE_TECHNOLOGIES])
+        link = project.live_url or project.github_url
+        link_line = f"\nLink: {link}" if link else ""
+        return f"""{project.title}
+{project.description}
+Technologies: {technologies}{link_line}"""
+
     def get_skills_by_category(self, category: Optional[str] = None) -> str:
         """
         Get formatted skills list
@@ -255,96 +613,129 @@ Period: {period}"""
 
 Experience: {len(experience)} positions
 Projects: {len(projects)} total ({len(featured_projects)} featured)
-Skills: {len(skills)} technical skills across {len(set(s.category for s in skills))} categories
+Skills: {len(skills)} technical skills across {len({s.category for s in skills})} categories
 Education: {len(education)} degrees
 
 Contact: {personal.email}
-Meeting Link: {personal.social.meeting_link or 'Not available'}"""
+Meeting Link: {personal.social.meeting_link or "Not available"}"""
 
-    def search_portfolio(self, query: str) -> str:
+    def search_portfolio(self, query: str, page: int = 1) -> str:
         """
         Search for content across all portfolio data
         @param query Search query
-        @returns Relevant results
+        @param page Page of voice output to return
+        @returns Relevant results, best match first
         """
-        normalized_query = query.lower()
-        results = []
-
-        # Search in experience
-        relevant_experience = [
-            exp
-            for exp in self.data.experience
-            if (
-                normalized_query in exp.company.lower()
-                or normalized_query in exp.position.lower()
-                or normalized_query in exp.description.lower()
-                or any(
-                    normalized_query in achievement.lower()
-                    for achievement in exp.achievements
-                )
-                or any(normalized_query in tech.lower() for tech in exp.technologies)
-            )
-        ]
-
-        if relevant_experience:
-            results.append("RELEVANT EXPERIENCE:")
-            results.append(
-                "\n\n".join(self._format_experience(exp) for exp in relevant_experience)
-            )
-
-        # Search in projects
-        relevant_projects = [
-            proj
-            for proj in self.data.projects
-            if (
-                normalized_query in proj.title.lower()
-                or normalized_query in proj.description.lower()
-                or any(normalized_query in tech.lower() for tech in proj.technologies)
-            )
-        ]
-
-        if relevant_projects:
-            results.append("\nRELEVANT PROJECTS:")
-            results.append(
-                "\n\n".join(self._format_project(proj) for proj in relevant_projects)
+        matches = self._search_index.search(query)
+        note = ""
+        if not matches:
+            # e.g. "post gress" or "health trip": retry with the indexed name
+            match = self._name_index.lookup(query)
+            if match:
+                note = _closest_match_note(query, match, match.value)
+                matches = self._search_index.search(match.value)
+
+        if not matches:
+            return f"No results found for: {query}"
+
+        brief = self.output_mode == OUTPUT_VOICE
+        blocks = (
+            self._format_search_result(document, brief) for document, _score in matches
+        )
+        if brief:
+            text = self._render_page(
+                "searchPortfolio", {"query": query}, blocks, len(matches), page
             )
-
-        # Search in skills
-        relevant_skills = [
-            skill
-            for skill in self.data.skills
-            if normalized_query in skill.name.lower()
-        ]
-
-        if relevant_skills:
-            results.append("\nRELEVANT SKILLS:")
-            results.append(", ".join(skill.name for skill in relevant_skills))
-
-        return "\n".join(results) if results else f"No results found for: {query}"
+            if text == NO_MORE_RESULTS:
+                return text
+            return note + "RELEVANT RESULTS:\n" + text
+        return note + "RELEVANT RESULTS:\n" + "\n\n".join(blocks)
+
+    def _format_search_result(self, document: Any, brief: bool = False) -> str:
+        """Format a single search hit according to its section"""
+        if isinstance(document, Experience):
+            if brief:
+                return self._format_experience_brief(document)
+            return self._format_experience(document)
+        if isinstance(document, Project):
+            if brief:
+                return self._format_project_brief(document)
+            return self._format_project(document)
+        category = self._format_category_name(document.category)
+        return f"Skill: {document.name} ({category})"
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    """One immutable version of the portfolio data and everything derived from it"""
+
+    version: int
+    provider: PortfolioDataProvider
+
+    @property
+    def data(self) -> PortfolioConfig:
+        return self.provider.data
+
+
+# Current snapshot; replaced wholesale, never mutated, so sessions holding an
+# older snapshot keep a consistent view while new sessions get the latest.
+# Built on first use (normally in prewarm), not at import
+_current_snapshot: Optional[PortfolioSnapshot] = None
+
+
+def get_current_snapshot() -> PortfolioSnapshot:
+    """Get the portfolio snapshot new sessions should use"""
+    global _current_snapshot
+    if _current_snapshot is None:
+        _current_snapshot = PortfolioSnapshot(
+            version=1, provider=PortfolioDataProvider()
+        )
+    return _current_snapshot
 
 
-# Create singleton instance
-_portfolio_data_provider = PortfolioDataProvider()
+async def publish_portfolio_data(data: PortfolioConfig) -> PortfolioSnapshot:
+    """
+    Build a new snapshot off the event loop and make it current
+    @param data Freshly loaded portfolio data
+    @returns The newly published snapshot
+    """
+    global _current_snapshot
+    loop = asyncio.get_running_loop()
+    provider = await loop.run_in_executor(None, PortfolioDataProvider, data)
+    version = _current_snapshot.version + 1 if _current_snapshot else 1
+    snapshot = PortfolioSnapshot(version, provider)
+    _current_snapshot = snapshot
+    set_portfolio_data(data)
+    return snapshot
 
 
 # Tool parameter interfaces
+@dataclass
 class GetExperienceParams:
     company: Optional[str] = None
 
 
+@dataclass
 class GetProjectsParams:
     featured: Optional[bool] = None
     project_id: Optional[str] = None
 
 
+@dataclass
 class GetSkillsParams:
     category: Optional[str] = None
 
 
+@dataclass
 class SearchPortfolioParams:
     query: str
 
 
+@dataclass
+class GetMoreParams:
+    handle: str
+
+
 # Function tool definitions for the voice agent
 function_tools = [
     {
@@ -393,7 +784,7 @@ function_tools = [
                 "properties": {
                     "category": {
                         "type": "string",
-                        "enum": ["frontend", "backend", "tools", "other"],
+                        "enum": SKILL_CATEGORIES,
                         "description": "Optional category to filter skills by",
                     },
                 },
@@ -461,50 +852,119 @@ function_tools = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "getMore",
+            "description": "Get the next part of a tool result that was cut short. Only call this when the user asks for more, passing the handle given at the end of the previous result.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "handle": {
+                        "type": "string",
+                        "description": "Continuation handle from the previous result",
+                    },
+                },
+                "required": ["handle"],
+            },
+        },
+    },
 ]
 
 
 # Function tool handlers
-def get_experience_handler(params: GetExperienceParams) -> str:
+def get_experience_handler(
+    provider: PortfolioDataProvider, params: GetExperienceParams
+) -> str:
     """Get work experience information"""
-    return _portfolio_data_provider.get_experience_summary(params.company)
+    return provider.get_experience_summary(params.company)
 
 
-def get_projects_handler(params: GetProjectsParams) -> str:
+def get_projects_handler(
+    provider: PortfolioDataProvider, params: GetProjectsParams
+) -> str:
     """Get project information"""
-    return _portfolio_data_provider.get_project_details(
-        params.featured, params.project_id
-    )
+    return provider.get_project_details(params.featured, params.project_id)
 
 
-def get_skills_handler(params: GetSkillsParams) -> str:
+def get_skills_handler(provider: PortfolioDataProvider, params: GetSkillsParams) -> str:
     """Get skills information"""
-    return _portfolio_data_provider.get_skills_by_category(params.category)
+    return provider.get_skills_by_category(params.category)
 
 
-def get_education_handler() -> str:
+def get_education_handler(provider: PortfolioDataProvider) -> str:
     """Get education information"""
-    return _portfolio_data_provider.get_education_summary()
+    return provider.get_education_summary()
 
 
-def get_contact_info_handler() -> str:
+def get_contact_info_handler(provider: PortfolioDataProvider) -> str:
     """Get contact information"""
-    return _portfolio_data_provider.get_contact_info()
+    return provider.get_contact_info()
 
 
-def get_personal_info_handler() -> str:
+def get_personal_info_handler(provider: PortfolioDataProvider) -> str:
     """Get personal information"""
-    return _portfolio_data_provider.get_personal_info()
+    return provider.get_personal_info()
 
 
-def get_portfolio_summary_handler() -> str:
+def get_portfolio_summary_handler(provider: PortfolioDataProvider) -> str:
     """Get portfolio summary"""
-    return _portfolio_data_provider.get_portfolio_summary()
+    return provider.get_portfolio_summary()
 
 
-def search_portfolio_handler(params: SearchPortfolioParams) -> str:
+def search_portfolio_handler(
+    provider: PortfolioDataProvider, params: SearchPortfolioParams
+) -> str:
     """Search portfolio"""
-    return _portfolio_data_provider.search_portfolio(params.query)
+    return provider.search_portfolio(params.query)
+
+
+def get_more_handler(provider: PortfolioDataProvider, params: GetMoreParams) -> str:
+    """Get the next page of a cut-short result"""
+    return provider.get_more(params.handle)
+
+
+# Parameter types for handlers that take arguments
+_param_types = {
+    "getExperience": GetExperienceParams,
+    "getProjects": GetProjectsParams,
+    "getSkills": GetSkillsParams,
+    "searchPortfolio": SearchPortfolioParams,
+    "getMore": GetMoreParams,
+}
+
+# Tool schema names that differ from the Python parameter names
+_param_aliases = {"projectId": "project_id"}
+
+# Parameters declared boolean in the tool schemas, by Python name
+_BOOLEAN_PARAMS = frozenset(
+    _param_aliases.get(name, name)
+    for tool in function_tools
+    for name, schema in tool["function"]["parameters"]["properties"].items()
+    if schema.get("type") == "boolean"
+)
+
+
+def tool_cache_key(function_name: str, args: Dict[str, Any]) -> ResponseCacheKey:
+    """
+    Identify a tool call independently of argument spelling
+    @param function_name Name of the tool
+    @param args Arguments as passed by the LLM or by agent code
+    @returns Hashable key; equal keys always produce the same response
+    """
+    args = {_param_aliases.get(key, key): value for key, value in args.items()}
+    return (function_name, _normalize_args(args))
+
+
+def is_heavy_call(function_name: str, args: Dict[str, Any]) -> bool:
+    """
+    Whether a tool call's cost grows with the portfolio
+    @returns True for HEAVY_FUNCTIONS, and for getMore on a handle from one
+    """
+    if function_name == "getMore":
+        decoded = decode_handle(str(args.get("handle", "")))
+        return decoded is not None and decoded[0] in HEAVY_FUNCTIONS
+    return function_name in HEAVY_FUNCTIONS
 
 
 # Handler mapping
@@ -517,35 +977,39 @@ function_handlers = {
     "getPersonalInfo": get_personal_info_handler,
     "getPortfolioSummary": get_portfolio_summary_handler,
     "searchPortfolio": search_portfolio_handler,
+    "getMore": get_more_handler,
 }
 
 
-def execute_function_tool(function_name: str, args: Dict[str, Any]) -> str:
+def execute_function_tool(
+    function_name: str,
+    args: Dict[str, Any],
+    provider: Optional[PortfolioDataProvider] = None,
+) -> str:
     """
     Execute a function tool by name
     @param function_name Name of the function to execute
     @param args Arguments to pass to the function
+    @param provider Data provider of the session's snapshot; defaults to current
     @returns Result of the function execution
     """
+    provider = provider or get_current_snapshot().provider
     handler = function_handlers.get(function_name)
 
     if not handler:
         return f"Error: Unknown function '{function_name}'"
 
     try:
-        # Convert args dict to appropriate parameter objects
-        if function_name == "getExperience":
-            params = GetExperienceParams(**args)
-        elif function_name == "getProjects":
-            params = GetProjectsParams(**args)
-        elif function_name == "getSkills":
-            params = GetSkillsParams(**args)
-        elif function_name == "searchPortfolio":
-            params = SearchPortfolioParams(**args)
+        args = {_param_aliases.get(key, key): value for key, value in args.items()}
+        param_type = _param_types.get(function_name)
+
+        # Convert args dict to the handler's parameter object, if it takes one
+        if param_type:
+            render = partial(handler, provider, param_type(**args))
         else:
-            params = args
+            render = partial(handler, provider)
 
-        return handler(params)
+        return provider.get_cached_response(function_name, args, render)
     except Exception as error:
         error_message = str(error)
         return f"Error executing {function_name}: {error_message}"
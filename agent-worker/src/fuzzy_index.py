@@ -0,0 +1,204 @@
+"""
+Fuzzy and phonetic name lookup for voice transcripts.
+
+Speech-to-text splits, merges and misspells proper nouns ("health trip",
+"A S T consulting", "lead code"), so exact matching on names fails and
+the LLM retries with another tool call. Every name is keyed three ways
+when the index is built:
+
+- compact key: lower-cased letters and digits only, so spacing and
+  punctuation differences disappear ("health trip" == "Healthtrip")
+- phonetic key: the compact key with vowels dropped and similar-sounding
+  consonants merged, so misspellings that sound alike collide
+- character trigrams, for anything else that is merely close
+
+The first two are dictionary lookups. A query that sounds like the start
+of a name ("lead code" for "LeetCode MCP Server") is found by bisecting
+the sorted phonetic keys. Short phonetic keys collide by chance ("rust"
+and "React" are both r23), so a sound-alike match on a short key must
+also pass the trigram threshold. Trigram candidates come from an inverted index
+and are scored with the Dice coefficient, so a lookup only touches names
+that share a trigram with the query.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Generic, List, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Consonants that sound alike share a code; vowels, h, w and y are dropped
+_PHONETIC_CODES = {
+    letter: code
+    for code, letters in {
+        "1": "bfpv",
+        "2": "cgjkqsxz",
+        "3": "dt",
+        "4": "l",
+        "5": "mn",
+        "6": "r",
+    }.items()
+    for letter in letters
+}
+_SILENT = frozenset("aeiouhwy")
+
+# Scores reported for the exact-key tiers, above any trigram score
+COMPACT_MATCH_SCORE = 1.0
+PHONETIC_MATCH_SCORE = 0.9
+PREFIX_MATCH_SCORE = 0.8
+DEFAULT_THRESHOLD = 0.6
+
+# Shortest phonetic key trusted without a trigram similarity check
+MIN_PHONETIC_CODES = 4
+
+# Shortest phonetic key that may match the start of a longer name; prefix
+# matches are not similarity-checked, so never below MIN_PHONETIC_CODES
+MIN_PREFIX_CODES = MIN_PHONETIC_CODES
+
+
+def compact_key(text: str) -> str:
+    """Lower-case letters and digits of text, without separators"""
+    return _NON_ALPHANUMERIC.sub("", text.lower())
+
+
+def phonetic_key(text: str) -> str:
+    """
+    Sound-alike key for text
+    @returns First letter kept as is, then consonant codes with repeats collapsed
+    """
+    return _phonetic_code(compact_key(text))
+
+
+def _phonetic_code(compact: str) -> str:
+    if not compact:
+        return ""
+    code = [compact[0]]
+    previous = _PHONETIC_CODES.get(compact[0])
+    for char in compact[1:]:
+        if char in _SILENT:
+            continue
+        current = _PHONETIC_CODES.get(char, char)
+        if current != previous:
+            code.append(current)
+        previous = current
+    return "".join(code)
+
+
+def _trigrams(compact: str) -> Set[str]:
+    padded = f"^{compact}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class FuzzyMatch(Generic[T]):
+    value: T
+    name: str
+    score: float
+
+
+class FuzzyIndex(Generic[T]):
+    """Maps spoken or misspelled names to indexed values"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._names: List[str] = []
+        self._values: List[T] = []
+        self._trigrams: List[Set[str]] = []
+        self._compact: Dict[str, int] = {}
+        # Short names often sound alike ("Redis", "Redux"): keep every entry
+        self._phonetic: Dict[str, List[int]] = {}
+        self._sorted_phonetic: List[str] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, value: T):
+        """
+        Index a name; an exact compact-key match returns the first value added
+        @param name Name as it would be spoken (company, project title, ...)
+        @param value Returned by lookup() when the name matches
+        """
+        compact = compact_key(name)
+        if not compact:
+            return
+        entry = len(self._names)
+        trigrams = _trigrams(compact)
+        self._names.append(name)
+        self._values.append(value)
+        self._trigrams.append(trigrams)
+        self._compact.setdefault(compact, entry)
+        self._phonetic.setdefault(_phonetic_code(compact), []).append(entry)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, []).append(entry)
+
+    def build(self) -> "FuzzyIndex[T]":
+        """Sort the phonetic keys for prefix lookups; call after the last add()"""
+        self._sorted_phonetic = sorted(self._phonetic)
+        return self
+
+    def _match(self, entry: int, score: float) -> FuzzyMatch[T]:
+        return FuzzyMatch(self._values[entry], self._names[entry], score)
+
+    def _similarity(self, trigrams: Set[str], entry: int) -> float:
+        """Dice coefficient between query trigrams and an entry's trigrams"""
+        candidate = self._trigrams[entry]
+        return 2 * len(trigrams & candidate) / (len(trigrams) + len(candidate))
+
+    def _closest(self, trigrams: Set[str], entries: List[int]) -> int:
+        # max() keeps the first of equal scores, i.e. the name indexed first
+        return max(entries, key=lambda entry: self._similarity(trigrams, entry))
+
+    def exact(self, query: str) -> Optional[T]:
+        """Value whose name has the same compact key as query, or None"""
+        entry = self._compact.get(compact_key(query))
+        return None if entry is None else self._values[entry]
+
+    def lookup(self, query: str) -> Optional[FuzzyMatch[T]]:
+        """
+        Find the best-matching name for a query
+        @param query Name as transcribed
+        @returns Best match at or above the threshold, or None
+        """
+        compact = compact_key(query)
+        if not compact:
+            return None
+
+        entry = self._compact.get(compact)
+        if entry is not None:
+            return self._match(entry, COMPACT_MATCH_SCORE)
+        trigrams = _trigrams(compact)
+        phonetic = _phonetic_code(compact)
+        entries = self._phonetic.get(phonetic)
+        if entries:
+            entry = self._closest(trigrams, entries)
+            if (
+                len(phonetic) >= MIN_PHONETIC_CODES
+                or self._similarity(trigrams, entry) >= self.threshold
+            ):
+                return self._match(entry, PHONETIC_MATCH_SCORE)
+        if len(phonetic) >= MIN_PREFIX_CODES:
+            position = bisect_left(self._sorted_phonetic, phonetic)
+            if position < len(self._sorted_phonetic) and self._sorted_phonetic[
+                position
+            ].startswith(phonetic):
+                entries = self._phonetic[self._sorted_phonetic[position]]
+                return self._match(self._closest(trigrams, entries), PREFIX_MATCH_SCORE)
+
+        shared: Dict[int, int] = {}
+        for trigram in trigrams:
+            for candidate in self._postings.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        best, best_score = -1, 0.0
+        for candidate, count in shared.items():
+            score = 2 * count / (len(trigrams) + len(self._trigrams[candidate]))
+            # Ties go to the name indexed first
+            if score > best_score or (score == best_score and candidate < best):
+                best, best_score = candidate, score
+        if best < 0 or best_score < self.threshold:
+            return None
+        return self._match(best, round(best_score, 3))
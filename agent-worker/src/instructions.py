@@ -0,0 +1,107 @@
+"""
+System instructions for the portfolio voice agent.
+
+The instruction text is built once per portfolio data version and shared
+by every session using that version, so each session sends a
+byte-identical prompt and the LLM provider can reuse its cached prefix.
+Everything in it comes from the snapshot; anything session-specific must
+be appended after the shared text, never interpolated into it.
+"""
+
+import hashlib
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List
+
+from function_tools import PortfolioSnapshot
+from portfolio_data import PortfolioConfig, format_portfolio_for_agent
+from voice_output import OUTPUT_VOICE
+
+# Most-used technologies listed under "data you can use"
+KNOWN_STACKS = 7
+
+# Extra guideline when tool results are cut to a token budget
+VOICE_OUTPUT_RULES = (
+    "9) tool results are trimmed to the highlights; only fetch more when they ask\n"
+)
+
+INSTRUCTIONS_TEMPLATE = """
+You are a helpful voice assistant for {name}'s portfolio website.
+
+Act like a friendly, slightly nerdy engineering buddy who answers questions about their experience, projects, skills, and background.
+
+{portfolio_summary}
+
+Voice response guidelines:
+1) keep answers short and human, like you're chatting on a call
+2) 3–4 sentences max unless they explicitly ask for more depth
+3) if it exists in the portfolio data, use real specifics (company names, stacks, metrics)
+4) if something isn't in the portfolio data, say you don't have that info
+5) offer to expand if they want to zoom in
+6) for visuals, just point them to the site (you're not a CDN)
+7) for availability or contact, share their contact / booking info
+8) tone = chill, sharp, confident, not corporate-marketing
+{output_rules}
+data you can use:
+{known_data}
+- contact + meeting scheduling info
+
+if the answer isn't in the known set → return politely with "not in my dataset" and offer to check another area.
+"""
+
+
+def _known_data(data: PortfolioConfig) -> List[str]:
+    """Bullets naming what the portfolio covers, most useful first"""
+    bullets = []
+    if data.experience:
+        companies = ", ".join(exp.company for exp in data.experience)
+        bullets.append(f"- experience at {companies}")
+    featured = [project.title for project in data.projects if project.featured]
+    if featured:
+        bullets.append(f"- projects like {', '.join(featured)}")
+
+    # Technologies ranked by how many roles and projects used them
+    usage = Counter(
+        technology
+        for item in [*data.experience, *data.projects]
+        for technology in dict.fromkeys(item.technologies)
+    )
+    stacks = [technology for technology, _count in usage.most_common(KNOWN_STACKS)]
+    if stacks:
+        bullets.append(f"- stacks: {', '.join(stacks)}")
+    for education in data.education:
+        bullets.append(
+            f"- {education.degree} {education.field}, {education.institution}"
+        )
+    return bullets
+
+
+@dataclass(frozen=True)
+class AgentInstructions:
+    text: str
+    # Identifies the exact prompt text; equal hashes mean a shared cache prefix
+    prefix_hash: str
+    data_version: int
+
+
+@lru_cache(maxsize=4)
+def build_instructions(snapshot: PortfolioSnapshot) -> AgentInstructions:
+    """
+    Build the shared instruction text for a portfolio data version
+    @param snapshot Portfolio snapshot the session is pinned to
+    @returns Instructions reused by every session on that snapshot
+    """
+    data = snapshot.data
+    voice_output = snapshot.provider.output_mode == OUTPUT_VOICE
+    text = INSTRUCTIONS_TEMPLATE.format(
+        name=data.personal.name,
+        portfolio_summary=format_portfolio_for_agent(data),
+        output_rules=VOICE_OUTPUT_RULES if voice_output else "",
+        known_data="\n".join(_known_data(data)),
+    )
+    return AgentInstructions(
+        text=text,
+        prefix_hash=hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+        data_version=snapshot.version,
+    )
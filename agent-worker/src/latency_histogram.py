@@ -0,0 +1,105 @@
+"""
+Fixed-bucket latency histograms for agent worker metrics.
+
+Every histogram uses the same bucket bounds, so memory per histogram is
+constant and histograms can be merged by adding their bucket counts.
+Percentiles are estimated by interpolating inside the matching bucket.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# Upper bounds in milliseconds; a final overflow bucket catches the rest
+BUCKET_BOUNDS_MS = (
+    1,
+    2,
+    5,
+    10,
+    25,
+    50,
+    75,
+    100,
+    150,
+    200,
+    300,
+    400,
+    500,
+    750,
+    1000,
+    1500,
+    2000,
+    3000,
+    5000,
+    10000,
+    30000,
+)
+
+REPORTED_PERCENTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    __slots__ = ("count", "counts", "max", "min", "total")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value_ms: float):
+        """Record a single latency sample in milliseconds"""
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        if self.min is None or value_ms < self.min:
+            self.min = value_ms
+        if self.max is None or value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's samples into this one"""
+        for index, bucket_count in enumerate(other.counts):
+            self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate a percentile from the bucket counts
+        @param percentile Percentile between 0 and 100
+        @returns Estimated latency in milliseconds, or None if empty
+        """
+        if not self.count:
+            return None
+
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = BUCKET_BOUNDS_MS[index - 1] if index > 0 else 0.0
+            upper = (
+                BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max
+            )
+            estimate = lower + (upper - lower) * ((rank - seen) / bucket_count)
+            # Never report beyond what was actually observed
+            return max(self.min, min(estimate, self.max))
+        return self.max
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Count, mean, max and reported percentiles for log output"""
+        result: Dict[str, Optional[float]] = {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "max": round(self.max, 2) if self.max is not None else None,
+        }
+        for percentile in REPORTED_PERCENTILES:
+            value = self.percentile(percentile)
+            result[f"p{percentile}"] = round(value, 2) if value is not None else None
+        return result
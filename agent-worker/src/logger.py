@@ -1,43 +1,188 @@
 """
 Structured logger for agent worker.
 Mirrors src_bak/logger.ts functionality.
+
+By default entries are serialized and written synchronously. In async mode
+(enable_async) the caller only enqueues a small tuple; a background thread
+does the timestamping, JSON serialization and handler I/O in batches, so
+log output never stalls the asyncio event loop that streams audio.
+
+Entries below the logger's level are discarded before any work is done.
+Context may be passed as a zero-argument callable, which is only invoked
+when the entry will actually be written.
 """
 
-import logging
+import atexit
 import json
-from typing import Any, Dict, Optional
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+OVERFLOW_DROP = "drop"
+OVERFLOW_BLOCK = "block"
+
+LogContext = Optional[Union[Dict[str, Any], Callable[[], Dict[str, Any]]]]
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+_STOP = object()
+
+
+def _format_timestamp(created: float) -> str:
+    """Format a timestamp the same way logging.Formatter.formatTime does"""
+    seconds = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(created))
+    return f"{seconds},{int((created % 1) * 1000):03d}"
 
 
 class StructuredLogger:
     def __init__(self, level: str = "info"):
         self.logger = logging.getLogger("portfolio-agent")
         self.set_level(level)
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        self._overflow_policy = OVERFLOW_DROP
+        self._block_timeout = 0.0
+        self._batch_size = 1
+        self.dropped_count = 0
+        self._reported_dropped_count = 0
 
     def set_level(self, level: str):
         self.logger.setLevel(getattr(logging, level.upper(), logging.INFO))
 
-    def log(self, level: str, message: str, context: Optional[Dict[str, Any]] = None):
+    @property
+    def is_async(self) -> bool:
+        return self._queue is not None
+
+    def enable_async(
+        self,
+        max_queue_size: int = 10_000,
+        overflow_policy: str = OVERFLOW_DROP,
+        block_timeout: float = 0.05,
+        batch_size: int = 256,
+    ):
+        """
+        Switch to queue-backed logging with a background writer thread
+        @param max_queue_size Maximum number of pending entries held in memory
+        @param overflow_policy "drop" discards new entries while the queue is
+            full; "block" waits up to block_timeout seconds before discarding
+        @param block_timeout Seconds to wait for space under the "block" policy
+        @param batch_size Maximum number of entries written per wake-up
+        """
+        if self._queue is not None:
+            return
+        if overflow_policy not in (OVERFLOW_DROP, OVERFLOW_BLOCK):
+            raise ValueError(f"Unknown log overflow policy: {overflow_policy}")
+
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._batch_size = max(1, batch_size)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._worker = threading.Thread(
+            target=self._drain_queue, name="structured-logger", daemon=True
+        )
+        self._worker.start()
+        atexit.register(self.disable_async)
+
+    def disable_async(self, timeout: float = 5.0):
+        """Flush pending entries, stop the writer thread and log synchronously"""
+        log_queue, worker = self._queue, self._worker
+        if log_queue is None or worker is None:
+            return
+        self._queue = None
+        self._worker = None
+        log_queue.put(_STOP)
+        worker.join(timeout)
+
+    def is_enabled_for(self, level: str) -> bool:
+        return self.logger.isEnabledFor(_LEVELS.get(level.lower(), logging.INFO))
+
+    def log(self, level: str, message: str, context: LogContext = None):
+        if not self.is_enabled_for(level):
+            return
+        if callable(context):
+            context = context()
+
+        log_queue = self._queue
+        if log_queue is None:
+            self._write(time.time(), level, message, context)
+            return
+
+        entry = (time.time(), level, message, dict(context) if context else None)
+        try:
+            if self._overflow_policy == OVERFLOW_BLOCK:
+                log_queue.put(entry, timeout=self._block_timeout)
+            else:
+                log_queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped_count += 1
+
+    def _write(
+        self,
+        created: float,
+        level: str,
+        message: str,
+        context: Optional[Dict[str, Any]],
+    ):
+        log_method = getattr(self.logger, level.lower(), self.logger.info)
         entry = {
-            "timestamp": logging.Formatter().formatTime(
-                logging.LogRecord("", "", "", "", "", "", "", ""), None
-            ),
+            "timestamp": _format_timestamp(created),
             "level": level.upper(),
             "message": message,
         }
         if context:
             entry.update(context)
-        getattr(self.logger, level.lower(), self.logger.info)(json.dumps(entry))
+        log_method(json.dumps(entry, default=str))
+
+    def _drain_queue(self):
+        """Writer thread: serialize and emit queued entries in batches"""
+        log_queue = self._queue
+        assert log_queue is not None
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is _STOP:
+                    return
+                try:
+                    self._write(*item)
+                except Exception:
+                    # Never let a bad entry kill the writer thread
+                    self.logger.exception("Failed to write log entry")
+
+            self._report_dropped()
+
+    def _report_dropped(self):
+        dropped = self.dropped_count - self._reported_dropped_count
+        if dropped > 0:
+            self._reported_dropped_count += dropped
+            self._write(
+                time.time(),
+                "warning",
+                "Log entries dropped",
+                {"dropped": dropped, "total_dropped": self.dropped_count},
+            )
 
-    def debug(self, message: str, context: Optional[Dict[str, Any]] = None):
+    def debug(self, message: str, context: LogContext = None):
         self.log("debug", message, context)
 
-    def info(self, message: str, context: Optional[Dict[str, Any]] = None):
+    def info(self, message: str, context: LogContext = None):
         self.log("info", message, context)
 
-    def warn(self, message: str, context: Optional[Dict[str, Any]] = None):
+    def warn(self, message: str, context: LogContext = None):
         self.log("warning", message, context)
 
-    def error(self, message: str, context: Optional[Dict[str, Any]] = None):
+    def error(self, message: str, context: LogContext = None):
         self.log("error", message, context)
 
 
@@ -0,0 +1,170 @@
+"""
+Event-loop lag sampling and blocking-call detection.
+
+A task on the event loop wakes every sample interval, records how late it
+woke (the loop lag) and refreshes a heartbeat. A watchdog thread checks
+the heartbeat; when the loop has not come back for longer than the stall
+threshold it captures the loop thread's stack while the blocking code is
+still running. The stall is reported from the loop once it recovers,
+attributed to the operation marked with operation() (for example a
+PortfolioAssistant tool) or otherwise to the innermost frame from this
+worker's own source files. All numbers end up in session_monitor.
+
+One loop is sampled at a time. With JOB_EXECUTOR=thread every job has its
+own loop; when the sampled job's loop shuts down, the monitor stops
+watching its thread and moves to another job loop that is still running.
+
+Opt-in with LOOP_MONITOR_ENABLED, since the watchdog thread and stack
+captures have a small cost of their own.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from config import config
+from session_monitor import session_monitor
+
+_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Innermost frames kept from a stalled stack
+STACK_DEPTH = 12
+
+
+def _attribute(stack: traceback.StackSummary) -> str:
+    """Name the innermost frame from this worker's code, else the innermost frame"""
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_SOURCE_DIR) and filename != os.path.abspath(__file__):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    def __init__(self, stall_threshold_ms: float, sample_interval: float):
+        self.stall_threshold = stall_threshold_ms / 1000
+        self.sample_interval = sample_interval
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        # None while no loop is sampled
+        self._loop_thread_id: Optional[int] = None
+        # Job loops that may be sampled next
+        self._loops: "weakref.WeakSet[asyncio.AbstractEventLoop]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._heartbeat = time.perf_counter()
+        self._operation: Optional[str] = None
+        # Written by the watchdog thread, consumed on the loop
+        self._pending_stall: Optional[Tuple[str, List[str]]] = None
+
+    def ensure_started(self):
+        """Start sampling on the running event loop, once per process"""
+        with self._lock:
+            self._loops.add(asyncio.get_running_loop())
+            if self._task is None or self._task.done():
+                self._bind()
+        if self._watchdog is None:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="loop-monitor", daemon=True
+            )
+            self._watchdog.start()
+
+    def _bind(self):
+        """Sample the running loop; call with _lock held"""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._task.add_done_callback(self._on_sample_done)
+
+    def _rebind(self):
+        with self._lock:
+            if self._task is None or self._task.done():
+                self._bind()
+
+    def _on_sample_done(self, task: asyncio.Task):
+        """The sampled loop is shutting down: move to another running job loop"""
+        with self._lock:
+            if task is not self._task:
+                return
+            # Its thread may live on idle; its stack is no stall
+            self._loop_thread_id = None
+            self._pending_stall = None
+            self._loops.discard(task.get_loop())
+            for loop in list(self._loops):
+                if loop.is_running() and not loop.is_closed():
+                    loop.call_soon_threadsafe(self._rebind)
+                    return
+
+    @contextmanager
+    def operation(self, name: str) -> Iterator[None]:
+        """Attribute any stall inside this block to the named operation"""
+        if threading.get_ident() != self._loop_thread_id:
+            # Another job's loop (JOB_EXECUTOR=thread); only one is sampled
+            yield
+            return
+        previous = self._operation
+        self._operation = name
+        try:
+            yield
+        finally:
+            self._operation = previous
+
+    async def _sample(self):
+        threshold_ms = self.stall_threshold * 1000
+        while True:
+            expected = time.perf_counter() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            lag_ms = max(0.0, (now - expected) * 1000)
+            thread_id = self._loop_thread_id
+            session_monitor.track_loop_lag(lag_ms, thread_id)
+
+            pending, self._pending_stall = self._pending_stall, None
+            if pending is not None:
+                session_monitor.track_loop_stall(
+                    pending[0], lag_ms, pending[1], thread_id
+                )
+            elif lag_ms >= threshold_ms:
+                # Too short for the watchdog to catch it in the act
+                session_monitor.track_loop_stall("unknown", lag_ms, [], thread_id)
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack while it is stalled"""
+        reported_heartbeat = None
+        deadline = self.stall_threshold + self.sample_interval
+        while True:
+            time.sleep(self.stall_threshold / 2)
+            thread_id = self._loop_thread_id
+            heartbeat = self._heartbeat
+            if thread_id is None or heartbeat == reported_heartbeat:
+                continue
+            if time.perf_counter() - heartbeat < deadline:
+                continue
+
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            reported_heartbeat = heartbeat
+            stack = traceback.extract_stack(frame)
+            del frame
+            source = self._operation or _attribute(stack)
+            formatted = [
+                line.strip() for line in traceback.format_list(stack[-STACK_DEPTH:])
+            ]
+            if self._loop_thread_id == thread_id:
+                self._pending_stall = (source, formatted)
+
+
+loop_monitor = LoopMonitor(
+    config.LOOP_STALL_THRESHOLD_MS, config.LOOP_LAG_SAMPLE_INTERVAL
+)
@@ -0,0 +1,318 @@
+"""
+Prometheus-compatible metrics endpoint for the agent worker.
+
+Sessions run in job processes, while the scrape endpoint lives in the
+main worker process on config.PORT. Each job process periodically builds
+a JSON snapshot of SessionMonitor and ErrorHandler state on its own event
+loop and writes it to METRICS_DIR; the HTTP server thread only reads those
+files and renders them. Nothing on the audio hot path takes a lock:
+latency samples go to per-thread histograms that the snapshot merges. A
+scrape never touches live monitor state.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+
+from config import config
+from error_handler import error_handler
+from latency_histogram import BUCKET_BOUNDS_MS
+from logger import logger
+from session_monitor import session_monitor
+
+METRIC_PREFIX = "portfolio_agent"
+
+# Snapshots older than this many publish intervals belong to dead processes
+STALE_SNAPSHOT_INTERVALS = 3
+
+
+def build_snapshot() -> Dict[str, Any]:
+    """
+    Capture monitor and error state for this process. Safe to call from any
+    thread: jobs sharing the process (JOB_EXECUTOR=thread) hold
+    session_monitor.lock while they change process-wide state, except for
+    latency samples, which are merged from per-thread histograms.
+    """
+    with session_monitor.lock:
+        return _build_snapshot()
+
+
+def _build_snapshot() -> Dict[str, Any]:
+    active = list(session_monitor.sessions.values())
+    totals = session_monitor.totals
+    return {
+        "pid": os.getpid(),
+        "active_sessions": len(active),
+        "sessions_ended": totals["sessions"],
+        "messages": totals["messages"] + sum(m.message_count for m in active),
+        "session_errors": totals["errors"] + sum(m.error_count for m in active),
+        "estimated_cost": totals["estimated_cost"]
+        + sum(m.api_usage.total_estimated_cost for m in active),
+        "tracked_errors": session_monitor.error_rates.summary(),
+        "handler_errors": error_handler.error_rates.summary(),
+        "circuits": {
+            dependency: breaker.to_dict()
+            for dependency, breaker in error_handler.breakers.items()
+        },
+        "loop_stalls": {
+            source: {"count": stall["count"], "total_ms": stall["total_ms"]}
+            for source, stall in session_monitor.loop_stalls.items()
+        },
+        "latencies": {
+            metric: {
+                "counts": list(histogram.counts),
+                "count": histogram.count,
+                "sum": histogram.total,
+            }
+            for metric, histogram in session_monitor.process_latencies().items()
+        },
+    }
+
+
+def _write_snapshot(directory: str, snapshot: Dict[str, Any]):
+    """Atomically replace this process's snapshot file"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{snapshot['pid']}.json")
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(temp_path, path)
+
+
+class SnapshotPublisher:
+    """Publishes this job process's snapshot on a fixed interval"""
+
+    def __init__(self, directory: str, interval: float):
+        self.directory = directory
+        self.interval = interval
+        self._task: Optional[Union[asyncio.Task, Future]] = None
+
+    def ensure_started(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Start the publish loop once per process
+        @param loop Loop to run on from another thread; defaults to the running loop
+        """
+        if self._task is None or self._task.done():
+            if loop is None:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            else:
+                self._task = asyncio.run_coroutine_threadsafe(self._run(), loop)
+
+    async def publish(self):
+        snapshot = build_snapshot()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, _write_snapshot, self.directory, snapshot)
+        except OSError as error:
+            logger.warn("Failed to publish metrics snapshot", {"error": str(error)})
+
+    async def _run(self):
+        while True:
+            await self.publish()
+            await asyncio.sleep(self.interval)
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def render_metrics(snapshots: List[Dict[str, Any]]) -> str:
+    """Render process snapshots in the Prometheus text exposition format"""
+    lines: List[str] = []
+
+    def family(name: str, metric_type: str, help_text: str):
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {metric_type}")
+
+    def sample(name: str, labels: Dict[str, Any], value: float):
+        lines.append(f"{METRIC_PREFIX}_{name}{_format_labels(labels)} {value}")
+
+    scalar_metrics = [
+        ("active_sessions", "gauge", "Sessions currently running", "active_sessions"),
+        ("sessions_ended_total", "counter", "Sessions ended", "sessions_ended"),
+        ("messages_total", "counter", "Messages handled", "messages"),
+        ("session_errors_total", "counter", "Errors tracked", "session_errors"),
+        (
+            "estimated_cost_dollars_total",
+            "counter",
+            "Estimated API spend",
+            "estimated_cost",
+        ),
+    ]
+    for name, metric_type, help_text, key in scalar_metrics:
+        family(name, metric_type, help_text)
+        for snapshot in snapshots:
+            sample(name, {"pid": snapshot["pid"]}, snapshot[key])
+
+    for name, key, help_text in [
+        ("tracked_errors_total", "tracked_errors", "Errors by type (session monitor)"),
+        ("handler_errors_total", "handler_errors", "Errors by type (error handler)"),
+    ]:
+        family(name, "counter", help_text)
+        for snapshot in snapshots:
+            for error_type, errors in sorted(snapshot[key].items()):
+                sample(
+                    name, {"pid": snapshot["pid"], "type": error_type}, errors["count"]
+                )
+    for name, key, help_text in [
+        (
+            "tracked_error_rate",
+            "tracked_errors",
+            "Errors per second over a trailing window (session monitor)",
+        ),
+        (
+            "handler_error_rate",
+            "handler_errors",
+            "Errors per second over a trailing window (error handler)",
+        ),
+    ]:
+        family(name, "gauge", help_text)
+        for snapshot in snapshots:
+            for error_type, errors in sorted(snapshot[key].items()):
+                for window, rate in errors["rates"].items():
+                    sample(
+                        name,
+                        {"pid": snapshot["pid"], "type": error_type, "window": window},
+                        rate,
+                    )
+
+    family("loop_stalls_total", "counter", "Event-loop stalls by attributed source")
+    for snapshot in snapshots:
+        for source, stall in sorted(snapshot.get("loop_stalls", {}).items()):
+            sample(
+                "loop_stalls_total",
+                {"pid": snapshot["pid"], "source": source},
+                stall["count"],
+            )
+    family("loop_stall_seconds_total", "counter", "Time the event loop spent stalled")
+    for snapshot in snapshots:
+        for source, stall in sorted(snapshot.get("loop_stalls", {}).items()):
+            sample(
+                "loop_stall_seconds_total",
+                {"pid": snapshot["pid"], "source": source},
+                stall["total_ms"] / 1000,
+            )
+
+    family("circuit_open", "gauge", "1 if the dependency's circuit is not closed")
+    for snapshot in snapshots:
+        for dependency, circuit in sorted(snapshot.get("circuits", {}).items()):
+            sample(
+                "circuit_open",
+                {"pid": snapshot["pid"], "dependency": dependency},
+                0 if circuit["state"] == "closed" else 1,
+            )
+    family("circuit_opens_total", "counter", "Times the dependency's circuit opened")
+    for snapshot in snapshots:
+        for dependency, circuit in sorted(snapshot.get("circuits", {}).items()):
+            sample(
+                "circuit_opens_total",
+                {"pid": snapshot["pid"], "dependency": dependency},
+                circuit["open_count"],
+            )
+
+    family("latency_seconds", "histogram", "Latency by pipeline stage and tool")
+    for snapshot in snapshots:
+        for metric, histogram in sorted(snapshot["latencies"].items()):
+            labels = {"pid": snapshot["pid"], "metric": metric}
+            cumulative = 0
+            for bound_ms, bucket_count in zip(BUCKET_BOUNDS_MS, histogram["counts"]):
+                cumulative += bucket_count
+                sample(
+                    "latency_seconds_bucket",
+                    {**labels, "le": bound_ms / 1000},
+                    cumulative,
+                )
+            sample(
+                "latency_seconds_bucket", {**labels, "le": "+Inf"}, histogram["count"]
+            )
+            sample("latency_seconds_sum", labels, histogram["sum"] / 1000)
+            sample("latency_seconds_count", labels, histogram["count"])
+
+    return "\n".join(lines) + "\n"
+
+
+def read_snapshots(directory: str, max_age: float) -> List[Dict[str, Any]]:
+    """Load fresh snapshot files, deleting ones left behind by dead processes"""
+    snapshots = []
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return snapshots
+
+    now = time.time()
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                os.remove(path)
+                continue
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return sorted(snapshots, key=lambda snapshot: snapshot["pid"])
+
+
+class MetricsServer:
+    """Serves merged snapshots at /metrics from a background thread"""
+
+    def __init__(self, port: int, directory: str, interval: float):
+        self.port = port
+        self.directory = directory
+        self.max_age = interval * STALE_SNAPSHOT_INTERVALS
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics(
+                    read_snapshots(server.directory, server.max_age)
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                # Scrapes are frequent; keep them out of the structured log
+                pass
+
+        self._server = ThreadingHTTPServer(("", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        ).start()
+        logger.info("Metrics endpoint started", {"port": self.port})
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+snapshot_publisher = SnapshotPublisher(
+    config.METRICS_DIR, config.METRICS_SNAPSHOT_INTERVAL
+)
@@ -7,12 +7,32 @@ This module loads portfolio data. It can load from:
 3. Local hardcoded data as fallback
 """
 
-import os
+import asyncio
+import hashlib
 import json
-from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
-import aiohttp
+import os
+import re
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from config import config
+from logger import logger
+from ts_config_parser import parse_exported_object
+
+if TYPE_CHECKING:
+    # Imported on first fetch; most processes never talk to the API
+    import aiohttp
+
+# Parsed config/portfolio.ts, reused across process spawns while unchanged
+CONFIG_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "portfolio_snapshot.json"
+)
+# Last good API response, served when the API is slow or unreachable
+API_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(__file__), "..", ".cache", "portfolio_api_snapshot.json"
+)
+# Bump when parsing or the snapshot layout changes to discard old snapshots
+CONFIG_SNAPSHOT_VERSION = 1
 
 
 @dataclass
@@ -114,20 +134,179 @@ class PortfolioConfig:
     education: List[Education]
 
 
+class PortfolioApiLoader:
+    """
+    Fetches portfolio data from the website's API without blocking the loop.
+    Uses a pooled aiohttp session, conditional GETs (ETag/If-Modified-Since)
+    and a hard total timeout; the last good response is persisted to disk.
+    """
+
+    def __init__(
+        self, url: str, timeout: float, snapshot_path: str = API_SNAPSHOT_PATH
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.snapshot_path = snapshot_path
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._snapshot_loaded = False
+
+    def load_snapshot(self) -> Optional[PortfolioConfig]:
+        """Read the last good API response from disk (synchronous, no network)"""
+        self._snapshot_loaded = True
+        snapshot = _read_json_file(self.snapshot_path)
+        if not snapshot or snapshot.get("url") != self.url:
+            return None
+        try:
+            data = portfolio_config_from_dict(snapshot["data"])
+        except (KeyError, TypeError):
+            return None
+        self._etag = snapshot.get("etag")
+        self._last_modified = snapshot.get("last_modified")
+        return data
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop != loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def fetch(self) -> Optional[PortfolioConfig]:
+        """
+        Fetch the portfolio if it changed since the last successful fetch
+        @returns Fresh data, or None if unchanged, unreachable or invalid
+        """
+        import aiohttp
+
+        if not self._snapshot_loaded:
+            # Seed the validators so the first request can already be a 304
+            await asyncio.get_running_loop().run_in_executor(None, self.load_snapshot)
+
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+
+        try:
+            async with self._get_session().get(self.url, headers=headers) as response:
+                if response.status == 304:
+                    return None
+                response.raise_for_status()
+                raw = await response.json(content_type=None)
+                data = portfolio_config_from_dict(raw)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            logger.warn(
+                "Portfolio API unavailable", {"url": self.url, "error": str(error)}
+            )
+            return None
+        except (ValueError, KeyError, TypeError) as error:
+            logger.warn(
+                "Portfolio API returned invalid data",
+                {"url": self.url, "error": str(error)},
+            )
+            return None
+
+        self._etag = etag
+        self._last_modified = last_modified
+        await asyncio.get_running_loop().run_in_executor(
+            None,
+            _write_json_file,
+            self.snapshot_path,
+            {
+                "url": self.url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "data": raw,
+            },
+        )
+        return data
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_api_loader: Optional[PortfolioApiLoader] = (
+    PortfolioApiLoader(config.PORTFOLIO_API_URL, config.PORTFOLIO_API_TIMEOUT)
+    if config.PORTFOLIO_API_URL
+    else None
+)
+
+
 def load_from_api() -> PortfolioConfig:
     """
-    Load portfolio data from the website's API endpoint
+    Load the last good portfolio snapshot fetched from the website's API.
+    Never touches the network; refresh_from_api() keeps the snapshot fresh.
     """
-    # This would load from the website's API when it's running
-    # For now, raise exception to fall back to other methods
-    raise Exception("API not available")
+    if _api_loader is None:
+        raise Exception("API not configured")
+    data = _api_loader.load_snapshot()
+    if data is None:
+        raise Exception("No API snapshot available")
+    return data
 
 
-def load_from_config_file() -> PortfolioConfig:
+async def refresh_from_api() -> Optional[PortfolioConfig]:
     """
-    Load portfolio data from shared config file
+    Fetch fresh data from the API in the background and make it current
+    @returns The new data if it changed, otherwise None
     """
-    # Try to find the website's config file
+    global _portfolio_data_cache
+    if _api_loader is None:
+        return None
+    data = await _api_loader.fetch()
+    if data is not None:
+        _portfolio_data_cache = data
+    return data
+
+
+async def close_api_loader():
+    """Close the API loader's HTTP session; call on the loop that fetched"""
+    if _api_loader is not None:
+        await _api_loader.close()
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _build(cls, raw: Dict[str, Any]):
+    """Build a dataclass from a camelCase dict, ignoring unknown keys"""
+    known = {field.name for field in fields(cls)}
+    values = {_snake_case(key): value for key, value in raw.items()}
+    return cls(**{key: value for key, value in values.items() if key in known})
+
+
+def portfolio_config_from_dict(raw: Dict[str, Any]) -> PortfolioConfig:
+    """
+    Build a PortfolioConfig from the camelCase shape used by config/portfolio.ts
+    """
+    personal = dict(raw["personal"])
+    personal["social"] = _build(SocialLinks, personal.get("social") or {})
+
+    return PortfolioConfig(
+        personal=_build(PersonalInfo, personal),
+        skills=[_build(Skill, skill) for skill in raw.get("skills", [])],
+        projects=[_build(Project, project) for project in raw.get("projects", [])],
+        experience=[_build(Experience, exp) for exp in raw.get("experience", [])],
+        education=[_build(Education, edu) for edu in raw.get("education", [])],
+    )
+
+
+def find_config_file() -> Optional[str]:
+    """Locate the website's shared config file, if it is reachable"""
     possible_paths = [
         "../config/portfolio.ts",  # Relative to agent-worker/src
         "../../config/portfolio.ts",  # From agent-worker/src to root/config
@@ -135,27 +314,94 @@ def load_from_config_file() -> PortfolioConfig:
     ]
 
     for path in possible_paths:
-        try:
-            full_path = os.path.join(os.path.dirname(__file__), path)
-            if os.path.exists(full_path):
-                # Parse TypeScript config file (simplified parsing)
-                with open(full_path, "r") as f:
-                    content = f.read()
-                    # This is a simplified parser - in production you'd use a proper TS parser
-                    return parse_typescript_config(content)
-        except Exception:
-            continue
+        full_path = os.path.join(os.path.dirname(__file__), path)
+        if os.path.exists(full_path):
+            return full_path
+    return None
+
+
+def load_from_config_file() -> PortfolioConfig:
+    """
+    Load portfolio data from shared config file
+    """
+    full_path = find_config_file()
+    if full_path is None:
+        raise Exception("Config file not found")
+    return load_config_with_snapshot(full_path)
+
+
+def _read_json_file(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
-    raise Exception("Config file not found")
+
+def _write_json_file(path: str, content: Dict[str, Any]):
+    """Atomically write a cache file; failures only cost a reload next time"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(content, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def load_config_with_snapshot(
+    config_path: str, snapshot_path: str = CONFIG_SNAPSHOT_PATH
+) -> PortfolioConfig:
+    """
+    Load config/portfolio.ts, reusing the on-disk snapshot when unchanged.
+    The snapshot is trusted outright when the file's mtime and size match;
+    otherwise the content hash decides whether it needs re-parsing.
+    """
+    source_path = os.path.abspath(config_path)
+    stat = os.stat(source_path)
+    snapshot = _read_json_file(snapshot_path)
+    if snapshot and (
+        snapshot.get("version") != CONFIG_SNAPSHOT_VERSION
+        or snapshot.get("source") != source_path
+    ):
+        snapshot = None
+
+    if (
+        snapshot
+        and snapshot.get("mtime_ns") == stat.st_mtime_ns
+        and snapshot.get("size") == stat.st_size
+    ):
+        return portfolio_config_from_dict(snapshot["data"])
+
+    with open(source_path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+
+    if snapshot and snapshot.get("sha256") == digest:
+        data = snapshot["data"]
+    else:
+        data = parse_exported_object(content.decode("utf-8"))
+
+    _write_json_file(
+        snapshot_path,
+        {
+            "version": CONFIG_SNAPSHOT_VERSION,
+            "source": source_path,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "data": data,
+        },
+    )
+    return portfolio_config_from_dict(data)
 
 
 def parse_typescript_config(content: str) -> PortfolioConfig:
     """
-    Parse TypeScript config content (simplified implementation)
+    Parse the exported object literal from TypeScript config content
     """
-    # This is a placeholder - in a real implementation you'd parse the TS file properly
-    # For now, just return hardcoded data
-    return load_hardcoded_data()
+    return portfolio_config_from_dict(parse_exported_object(content))
 
 
 def load_hardcoded_data() -> PortfolioConfig:
@@ -254,11 +500,11 @@ def load_hardcoded_data() -> PortfolioConfig:
 def load_portfolio_data() -> PortfolioConfig:
     """
     Load portfolio data. Tries multiple sources:
-    1. API endpoint (if running)
+    1. Last good API snapshot (if an API URL is configured)
     2. Shared config file
     3. Hardcoded data as fallback
     """
-    # Try to load from API first
+    # Try the API snapshot first; refresh_from_api() fetches in the background
     try:
         return load_from_api()
     except Exception:
@@ -285,7 +531,7 @@ def format_portfolio_for_agent(data: PortfolioConfig) -> str:
     education = data.education
 
     featured_projects = [p for p in projects if p.featured]
-    skill_categories = set(skill.category for skill in skills)
+    skill_categories = {skill.category for skill in skills}
 
     return f"""
 Portfolio Owner: {personal.name}
@@ -300,9 +546,9 @@ Quick Stats:
 
 Contact Information:
 - Email: {personal.email}
-- Meeting Link: {personal.social.meeting_link or 'Not available'}
-- GitHub: {personal.social.github or 'Not available'}
-- LinkedIn: {personal.social.linkedin or 'Not available'}
+- Meeting Link: {personal.social.meeting_link or "Not available"}
+- GitHub: {personal.social.github or "Not available"}
+- LinkedIn: {personal.social.linkedin or "Not available"}
 """.strip()
 
 
@@ -316,3 +562,9 @@ def get_portfolio_data() -> PortfolioConfig:
     if _portfolio_data_cache is None:
         _portfolio_data_cache = load_portfolio_data()
     return _portfolio_data_cache
+
+
+def set_portfolio_data(data: PortfolioConfig):
+    """Replace the cached portfolio data with an already-loaded version"""
+    global _portfolio_data_cache
+    _portfolio_data_cache = data
@@ -0,0 +1,121 @@
+"""
+Hot reload of portfolio data for long-running job processes.
+
+When an API URL is configured the reloader polls the API loader;
+otherwise it watches config/portfolio.ts for changes. New data is turned
+into a fresh PortfolioSnapshot off the event loop and swapped in
+atomically, so sessions already running keep the version they started
+with and only sessions started afterwards see the update.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Future
+from typing import Optional, Tuple, Union
+
+from config import config
+from function_tools import get_current_snapshot, publish_portfolio_data
+from logger import logger
+from portfolio_data import (
+    PortfolioConfig,
+    close_api_loader,
+    find_config_file,
+    load_config_with_snapshot,
+    refresh_from_api,
+)
+
+SOURCE_API = "api"
+SOURCE_CONFIG_FILE = "config_file"
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class PortfolioReloader:
+    """Keeps the current portfolio snapshot in sync with its source"""
+
+    def __init__(self, api_poll_interval: float, file_poll_interval: float):
+        self.api_poll_interval = api_poll_interval
+        self.file_poll_interval = file_poll_interval
+        self._task: Optional[Union[asyncio.Task, Future]] = None
+        self._config_path: Optional[str] = None
+        self._config_signature: Optional[Tuple[int, int]] = None
+
+    def ensure_started(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Start the reload loop once per process
+        @param loop Loop to run on from another thread; defaults to the running loop
+        """
+        if self._task is None or self._task.done():
+            if loop is None:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            else:
+                self._task = asyncio.run_coroutine_threadsafe(self._run(), loop)
+
+    async def stop(self):
+        """
+        Cancel the reload loop and close the API client session. Must run on
+        the loop the reloader was started on.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            if isinstance(task, asyncio.Task):
+                await asyncio.gather(task, return_exceptions=True)
+        await close_api_loader()
+
+    async def _run(self):
+        if config.PORTFOLIO_API_URL:
+            source, interval = SOURCE_API, self.api_poll_interval
+        else:
+            source, interval = SOURCE_CONFIG_FILE, self.file_poll_interval
+            self._config_path = find_config_file()
+            if self._config_path is None:
+                logger.info("No portfolio config file to watch, hot reload disabled")
+                return
+
+        while True:
+            try:
+                if source == SOURCE_API:
+                    data = await refresh_from_api()
+                else:
+                    data = await self._check_config_file()
+                if data is not None:
+                    await self._publish(data, source)
+            except Exception as e:
+                logger.warn(
+                    "Portfolio reload failed", {"source": source, "error": str(e)}
+                )
+            await asyncio.sleep(interval)
+
+    async def _check_config_file(self) -> Optional[PortfolioConfig]:
+        """Reload config/portfolio.ts if its mtime or size changed"""
+        assert self._config_path is not None
+        loop = asyncio.get_running_loop()
+        signature = await loop.run_in_executor(None, _file_signature, self._config_path)
+        if signature is None or signature == self._config_signature:
+            return None
+        self._config_signature = signature
+        return await loop.run_in_executor(
+            None, load_config_with_snapshot, self._config_path
+        )
+
+    async def _publish(self, data: PortfolioConfig, source: str):
+        # The first check of the config file always loads it; skip the swap
+        # when nothing actually changed so caches stay warm
+        if data == get_current_snapshot().data:
+            return
+        snapshot = await publish_portfolio_data(data)
+        logger.info(
+            "Portfolio data reloaded", {"version": snapshot.version, "source": source}
+        )
+
+
+portfolio_reloader = PortfolioReloader(
+    config.PORTFOLIO_API_POLL_INTERVAL, config.PORTFOLIO_RELOAD_INTERVAL
+)
@@ -0,0 +1,75 @@
+"""
+Prewarmed resource registry for agent worker job processes.
+
+Heavy objects (VAD models, portfolio data and snapshot) are loaded once
+in the job process prewarm hook and stored on JobProcess.userdata, so each
+session started in that process reuses them instead of loading its own
+copy. With JOB_EXECUTOR=thread, every job thread gets its own JobProcess
+and prewarm call, but they all share one registry, so the process loads
+each resource only once.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from livekit.agents import JobProcess
+
+from logger import logger
+
+# Key under which the registry lives in JobProcess.userdata
+USERDATA_KEY = "resources"
+
+# Resource names
+VAD = "vad"
+PORTFOLIO_DATA = "portfolio_data"
+PORTFOLIO_SNAPSHOT = "portfolio_snapshot"
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self._resources: Dict[str, Any] = {}
+        self.load_times_ms: Dict[str, float] = {}
+        # Held while loading, so concurrent job threads load a resource once
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def load(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Load a resource now, recording how long it took"""
+        with self._lock:
+            start = time.perf_counter()
+            resource = loader()
+            self.load_times_ms[name] = (time.perf_counter() - start) * 1000
+            self._resources[name] = resource
+            return resource
+
+    def ensure(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Load a resource unless an earlier prewarm in this process already did"""
+        with self._lock:
+            if name in self._resources:
+                return self._resources[name]
+            return self.load(name, loader)
+
+    def get(self, name: str, loader: Callable[[], Any]) -> Any:
+        """Return a prewarmed resource, loading it on demand if prewarm missed it"""
+        with self._lock:
+            if name in self._resources:
+                return self._resources[name]
+            logger.warn(
+                "Resource was not prewarmed, loading on demand", {"resource": name}
+            )
+            return self.load(name, loader)
+
+
+# Shared by every JobProcess in this process (one per job thread)
+_process_registry = ResourceRegistry()
+
+
+def get_resource_registry(proc: JobProcess) -> ResourceRegistry:
+    """Get the process's resource registry and attach it to the job process"""
+    registry = proc.userdata.get(USERDATA_KEY)
+    if registry is None:
+        registry = proc.userdata[USERDATA_KEY] = _process_registry
+    return registry
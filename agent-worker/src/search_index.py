@@ -0,0 +1,158 @@
+"""
+Inverted search index for portfolio content.
+
+Documents are tokenized once when the index is built, and every posting
+stores its precomputed BM25 weight, so answering a query only needs a
+dictionary lookup per query term plus a sum over the matching postings.
+"""
+
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Keeps "c++" / "c#" intact; "next.js" becomes "next" and "js"
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+[+#]*")
+
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "any",
+        "are",
+        "at",
+        "did",
+        "do",
+        "does",
+        "for",
+        "from",
+        "has",
+        "have",
+        "he",
+        "his",
+        "in",
+        "is",
+        "it",
+        "of",
+        "on",
+        "or",
+        "the",
+        "to",
+        "was",
+        "what",
+        "with",
+    }
+)
+
+# Weight applied to vocabulary terms reached through prefix expansion
+# ("kube" -> "kubernetes"), so exact term hits always rank first
+PREFIX_MATCH_WEIGHT = 0.5
+MIN_PREFIX_LENGTH = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-cased search terms, dropping stop words"""
+    return [
+        token
+        for token in _TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over weighted document fields"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._documents: List[Any] = []
+        self._term_frequencies: List[Counter] = []
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._vocabulary: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add_document(
+        self, document: Any, fields: Iterable[Tuple[Optional[str], float]]
+    ):
+        """
+        Add a document to the index
+        @param document Object returned by search() when this document matches
+        @param fields (text, weight) pairs; a weight of 2.0 counts every term twice
+        """
+        frequencies: Counter = Counter()
+        for text, weight in fields:
+            if not text:
+                continue
+            for token in tokenize(text):
+                frequencies[token] += weight
+        self._documents.append(document)
+        self._term_frequencies.append(frequencies)
+
+    def build(self) -> "SearchIndex":
+        """Compute postings and BM25 weights for every added document"""
+        lengths = [sum(freqs.values()) for freqs in self._term_frequencies]
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        document_count = len(self._documents)
+
+        document_frequencies: Counter = Counter()
+        for frequencies in self._term_frequencies:
+            document_frequencies.update(frequencies.keys())
+
+        postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_index, frequencies in enumerate(self._term_frequencies):
+            length_norm = self.k1 * (
+                1 - self.b + self.b * (lengths[doc_index] / average_length)
+                if average_length
+                else 1.0
+            )
+            for term, tf in frequencies.items():
+                df = document_frequencies[term]
+                idf = math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+                weight = idf * (tf * (self.k1 + 1)) / (tf + length_norm)
+                postings.setdefault(term, []).append((doc_index, weight))
+
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+        return self
+
+    def _expand_term(self, term: str) -> List[Tuple[str, float]]:
+        """Resolve a query term to indexed terms with their match weights"""
+        if term in self._postings:
+            return [(term, 1.0)]
+        if len(term) < MIN_PREFIX_LENGTH:
+            return []
+
+        expanded = []
+        position = bisect_left(self._vocabulary, term)
+        while position < len(self._vocabulary) and self._vocabulary[
+            position
+        ].startswith(term):
+            expanded.append((self._vocabulary[position], PREFIX_MATCH_WEIGHT))
+            position += 1
+        return expanded
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Rank documents against a free-text query
+        @param query Search query
+        @param limit Optional maximum number of results
+        @returns (document, score) pairs, best match first
+        """
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            for indexed_term, match_weight in self._expand_term(term):
+                for doc_index, weight in self._postings[indexed_term]:
+                    scores[doc_index] = scores.get(doc_index, 0.0) + (
+                        weight * match_weight
+                    )
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self._documents[doc_index], score) for doc_index, score in ranked]
@@ -3,12 +3,93 @@ Session monitoring and metrics for agent worker.
 Mirrors src_bak/session-monitor.ts functionality.
 """
 
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from config import config
+from error_rates import ErrorRates
+from latency_histogram import LatencyHistogram
 from logger import logger
-from typing import Dict, Optional
-from datetime import datetime
+
+
+class ApiUsage:
+    """Flat per-session usage counters; the nested dict is built on demand"""
+
+    __slots__ = (
+        "llm_estimated_cost",
+        "llm_input_tokens",
+        "llm_output_tokens",
+        "llm_requests",
+        "stt_audio_seconds",
+        "stt_estimated_cost",
+        "stt_requests",
+        "tts_characters",
+        "tts_estimated_cost",
+        "tts_requests",
+    )
+
+    def __init__(self):
+        self.stt_requests = 0
+        self.stt_audio_seconds = 0.0
+        self.stt_estimated_cost = 0.0
+        self.llm_requests = 0
+        self.llm_input_tokens = 0
+        self.llm_output_tokens = 0
+        self.llm_estimated_cost = 0.0
+        self.tts_requests = 0
+        self.tts_characters = 0
+        self.tts_estimated_cost = 0.0
+
+    @property
+    def total_estimated_cost(self) -> float:
+        return (
+            self.stt_estimated_cost + self.llm_estimated_cost + self.tts_estimated_cost
+        )
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            "stt": {
+                "requests": self.stt_requests,
+                "audio_seconds": self.stt_audio_seconds,
+                "estimated_cost": self.stt_estimated_cost,
+            },
+            "llm": {
+                "requests": self.llm_requests,
+                "input_tokens": self.llm_input_tokens,
+                "output_tokens": self.llm_output_tokens,
+                "total_tokens": self.llm_input_tokens + self.llm_output_tokens,
+                "estimated_cost": self.llm_estimated_cost,
+            },
+            "tts": {
+                "requests": self.tts_requests,
+                "characters": self.tts_characters,
+                "estimated_cost": self.tts_estimated_cost,
+            },
+            "total": {"estimated_cost": self.total_estimated_cost},
+        }
 
 
 class SessionMetrics:
+    __slots__ = (
+        "agent_message_count",
+        "api_usage",
+        "duration",
+        "end_time",
+        "error_count",
+        "latencies",
+        "loop_stall_count",
+        "message_count",
+        "participant_id",
+        "room_name",
+        "session_id",
+        "start_time",
+        "status",
+        "thread_id",
+        "user_message_count",
+    )
+
     def __init__(
         self, session_id: str, room_name: str, participant_id: Optional[str] = None
     ):
@@ -16,37 +97,85 @@ class SessionMetrics:
         self.room_name = room_name
         self.participant_id = participant_id
         self.start_time = datetime.utcnow()
-        self.end_time = None
-        self.duration = None
+        self.end_time: Optional[datetime] = None
+        self.duration: Optional[float] = None
         self.message_count = 0
         self.user_message_count = 0
         self.agent_message_count = 0
         self.status = "active"
         self.error_count = 0
-        self.api_usage = {
-            "stt": {"requests": 0, "audio_seconds": 0.0, "estimated_cost": 0.0},
-            "llm": {
-                "requests": 0,
-                "input_tokens": 0,
-                "output_tokens": 0,
-                "total_tokens": 0,
-                "estimated_cost": 0.0,
-            },
-            "tts": {"requests": 0, "characters": 0, "estimated_cost": 0.0},
-            "total": {"estimated_cost": 0.0},
-        }
+        self.api_usage = ApiUsage()
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.loop_stall_count = 0
+        # Thread of the event loop the session runs on
+        self.thread_id = threading.get_ident()
+
+
+def _record_latency(
+    latencies: Dict[str, LatencyHistogram], metric: str, latency_ms: float
+):
+    histogram = latencies.get(metric)
+    if histogram is None:
+        histogram = latencies[metric] = LatencyHistogram()
+    histogram.record(latency_ms)
+
+
+def _merge_latencies(
+    target: Dict[str, LatencyHistogram], source: Dict[str, LatencyHistogram]
+):
+    # copy() is atomic, so the owning thread may add metrics meanwhile
+    for metric, histogram in source.copy().items():
+        merged = target.get(metric)
+        if merged is None:
+            merged = target[metric] = LatencyHistogram()
+        merged.merge(histogram)
 
 
 class SessionMonitor:
-    def __init__(self):
+    """
+    Per-session metrics plus process-wide aggregates. A session's own
+    counters are only touched from its job's event loop; sessions and the
+    process-wide state they share are guarded by lock, since with
+    JOB_EXECUTOR=thread several jobs run in one process on separate threads.
+    Latency samples are the exception: they arrive on the audio hot path,
+    so each thread records into its own process-wide histograms without
+    the lock, and process_latencies() merges them.
+    """
+
+    def __init__(
+        self, max_ended_sessions: int = 100, ended_session_max_age: float = 3600.0
+    ):
+        # Active sessions only; ended sessions move to the bounded history
         self.sessions: Dict[str, SessionMetrics] = {}
-        self.error_metrics: Dict[str, Dict] = {}
+        self.ended_sessions: Deque[SessionMetrics] = deque(maxlen=max_ended_sessions)
+        self.ended_session_max_age = timedelta(seconds=ended_session_max_age)
+        self.totals = {
+            "sessions": 0,
+            "duration": 0.0,
+            "messages": 0,
+            "errors": 0,
+            "estimated_cost": 0.0,
+        }
+        self.error_rates = ErrorRates()
+        # Process-wide latency histograms, one set per recording thread
+        self._thread_latencies: List[
+            Tuple[threading.Thread, Dict[str, LatencyHistogram]]
+        ] = []
+        # Histograms of recording threads that have exited, merged
+        self._retired_latencies: Dict[str, LatencyHistogram] = {}
+        self._local = threading.local()
+        # Event-loop stalls, keyed by the tool or call they were attributed to
+        self.loop_stalls: Dict[str, Dict[str, Any]] = {}
+        # Per-session state to release when the session ends
+        self._end_callbacks: Dict[str, List[Callable[[], None]]] = {}
+        self.lock = threading.RLock()
 
     def start_session(
         self, session_id: str, room_name: str, participant_id: Optional[str] = None
     ):
         metrics = SessionMetrics(session_id, room_name, participant_id)
-        self.sessions[session_id] = metrics
+        with self.lock:
+            self.sessions[session_id] = metrics
         logger.info(
             "Session started",
             {
@@ -57,8 +186,17 @@ class SessionMonitor:
             },
         )
 
+    def on_session_end(self, session_id: str, callback: Callable[[], None]):
+        """Run callback when end_session is called for this session"""
+        with self.lock:
+            self._end_callbacks.setdefault(session_id, []).append(callback)
+
     def end_session(self, session_id: str, status: str = "completed"):
-        metrics = self.sessions.get(session_id)
+        with self.lock:
+            callbacks = self._end_callbacks.pop(session_id, ())
+            metrics = self.sessions.pop(session_id, None)
+        for callback in callbacks:
+            callback()
         if not metrics:
             logger.warn(
                 "Attempted to end non-existent session", {"session_id": session_id}
@@ -77,11 +215,29 @@ class SessionMonitor:
                 "duration": metrics.duration,
                 "message_count": metrics.message_count,
                 "status": status,
-                "api_usage": metrics.api_usage,
+                "api_usage": metrics.api_usage.to_dict(),
                 "timestamp": metrics.end_time.isoformat(),
             },
         )
         self.log_session_summary(metrics)
+        with self.lock:
+            self._retire_session(metrics)
+
+    def _retire_session(self, metrics: SessionMetrics):
+        """Fold an ended session into the totals and keep it in recent history"""
+        self.totals["sessions"] += 1
+        self.totals["duration"] += metrics.duration or 0.0
+        self.totals["messages"] += metrics.message_count
+        self.totals["errors"] += metrics.error_count
+        self.totals["estimated_cost"] += metrics.api_usage.total_estimated_cost
+        self.ended_sessions.append(metrics)
+        self.prune_ended_sessions()
+
+    def prune_ended_sessions(self, now: Optional[datetime] = None):
+        """Drop ended sessions older than the retention age"""
+        cutoff = (now or datetime.utcnow()) - self.ended_session_max_age
+        while self.ended_sessions and self.ended_sessions[0].end_time < cutoff:
+            self.ended_sessions.popleft()
 
     def track_user_message(self, session_id: str):
         metrics = self.sessions.get(session_id)
@@ -99,32 +255,35 @@ class SessionMonitor:
         metrics = self.sessions.get(session_id)
         if not metrics:
             return
-        metrics.api_usage["stt"]["requests"] += 1
-        metrics.api_usage["stt"]["audio_seconds"] += audio_seconds
+        usage = metrics.api_usage
+        usage.stt_requests += 1
+        usage.stt_audio_seconds += audio_seconds
         cost = audio_seconds * 0.00025
-        metrics.api_usage["stt"]["estimated_cost"] += cost
-        metrics.api_usage["total"]["estimated_cost"] += cost
+        usage.stt_estimated_cost += cost
         logger.debug(
             "STT usage tracked",
-            {"session_id": session_id, "audio_seconds": audio_seconds, "cost": cost},
+            lambda: {
+                "session_id": session_id,
+                "audio_seconds": audio_seconds,
+                "cost": cost,
+            },
         )
 
     def track_llm_usage(self, session_id: str, input_tokens: int, output_tokens: int):
         metrics = self.sessions.get(session_id)
         if not metrics:
             return
-        metrics.api_usage["llm"]["requests"] += 1
-        metrics.api_usage["llm"]["input_tokens"] += input_tokens
-        metrics.api_usage["llm"]["output_tokens"] += output_tokens
-        metrics.api_usage["llm"]["total_tokens"] += input_tokens + output_tokens
+        usage = metrics.api_usage
+        usage.llm_requests += 1
+        usage.llm_input_tokens += input_tokens
+        usage.llm_output_tokens += output_tokens
         input_cost = (input_tokens / 1_000_000) * 0.15
         output_cost = (output_tokens / 1_000_000) * 0.6
         total_cost = input_cost + output_cost
-        metrics.api_usage["llm"]["estimated_cost"] += total_cost
-        metrics.api_usage["total"]["estimated_cost"] += total_cost
+        usage.llm_estimated_cost += total_cost
         logger.debug(
             "LLM usage tracked",
-            {
+            lambda: {
                 "session_id": session_id,
                 "input_tokens": input_tokens,
                 "output_tokens": output_tokens,
@@ -136,30 +295,134 @@ class SessionMonitor:
         metrics = self.sessions.get(session_id)
         if not metrics:
             return
-        metrics.api_usage["tts"]["requests"] += 1
-        metrics.api_usage["tts"]["characters"] += characters
+        usage = metrics.api_usage
+        usage.tts_requests += 1
+        usage.tts_characters += characters
         cost = (characters / 1000) * 0.015
-        metrics.api_usage["tts"]["estimated_cost"] += cost
-        metrics.api_usage["total"]["estimated_cost"] += cost
+        usage.tts_estimated_cost += cost
         logger.debug(
             "TTS usage tracked",
-            {"session_id": session_id, "characters": characters, "cost": cost},
+            lambda: {"session_id": session_id, "characters": characters, "cost": cost},
         )
 
+    def _local_latencies(self) -> Dict[str, LatencyHistogram]:
+        """This thread's process-wide histograms; only this thread writes them"""
+        latencies = getattr(self._local, "latencies", None)
+        if latencies is None:
+            latencies = self._local.latencies = {}
+            with self.lock:
+                self._thread_latencies.append((threading.current_thread(), latencies))
+        return latencies
+
+    def process_latencies(self) -> Dict[str, LatencyHistogram]:
+        """
+        Merge every thread's latency histograms
+        @returns New histograms; a sample being recorded meanwhile may be
+        missing from this merge and shows up in the next
+        """
+        merged: Dict[str, LatencyHistogram] = {}
+        with self.lock:
+            live = []
+            for thread, latencies in self._thread_latencies:
+                if thread.is_alive():
+                    live.append((thread, latencies))
+                else:
+                    # Nothing writes these any more; fold them in for good
+                    _merge_latencies(self._retired_latencies, latencies)
+            self._thread_latencies = live
+            _merge_latencies(merged, self._retired_latencies)
+            for _thread, latencies in live:
+                _merge_latencies(merged, latencies)
+        return merged
+
+    def reset_latencies(self):
+        """Drop every process-wide latency sample recorded so far"""
+        with self.lock:
+            self._retired_latencies.clear()
+            for _thread, latencies in self._thread_latencies:
+                latencies.clear()
+
+    def track_latency(self, session_id: str, metric: str, latency_ms: float):
+        """
+        Record a latency sample for a session and for the whole process
+        @param metric Metric name, e.g. "llm_ttft" or "tool.getSkills"
+        @param latency_ms Latency in milliseconds
+        """
+        _record_latency(self._local_latencies(), metric, latency_ms)
+        metrics = self.sessions.get(session_id)
+        if metrics:
+            _record_latency(metrics.latencies, metric, latency_ms)
+
+    def _sessions_on_thread(self, thread_id: Optional[int]) -> List[SessionMetrics]:
+        """Active sessions running on the given loop thread (all if None)"""
+        # list() copies atomically while other jobs start and end sessions
+        return [
+            metrics
+            for metrics in list(self.sessions.values())
+            if thread_id is None or metrics.thread_id == thread_id
+        ]
+
+    def track_loop_lag(self, lag_ms: float, thread_id: Optional[int] = None):
+        """
+        Record an event-loop lag sample for the process and the sessions on that loop
+        @param thread_id Thread of the sampled loop; None means every session
+        """
+        _record_latency(self._local_latencies(), "event_loop_lag", lag_ms)
+        for metrics in self._sessions_on_thread(thread_id):
+            _record_latency(metrics.latencies, "event_loop_lag", lag_ms)
+
+    def track_loop_stall(
+        self,
+        source: str,
+        duration_ms: float,
+        stack: List[str],
+        thread_id: Optional[int] = None,
+    ):
+        """
+        Record an event-loop stall
+        @param source Tool or function the stall was attributed to
+        @param duration_ms How long the loop was blocked
+        @param stack Formatted stack of the loop thread during the stall
+        @param thread_id Thread of the stalled loop; None means every session
+        """
+        with self.lock:
+            stall = self.loop_stalls.get(source)
+            if stall is None:
+                stall = self.loop_stalls[source] = {
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            stall["count"] += 1
+            stall["total_ms"] += duration_ms
+            stall["max_ms"] = max(stall["max_ms"], duration_ms)
+            stall["stack"] = stack
+            affected = self._sessions_on_thread(thread_id)
+            for metrics in affected:
+                metrics.loop_stall_count += 1
+        logger.warn(
+            "Event loop stall",
+            {
+                "source": source,
+                "duration_ms": round(duration_ms, 2),
+                "active_sessions": [metrics.session_id for metrics in affected],
+                "stack": stack,
+            },
+        )
+
+    def latency_summary(
+        self, latencies: Dict[str, LatencyHistogram]
+    ) -> Dict[str, Dict]:
+        return {
+            metric: histogram.summary()
+            for metric, histogram in sorted(latencies.items())
+        }
+
     def track_error(self, session_id: str, error_type: str):
         metrics = self.sessions.get(session_id)
         if metrics:
             metrics.error_count += 1
-        error_metric = self.error_metrics.get(error_type)
-        if error_metric:
-            error_metric["count"] += 1
-            error_metric["last_occurrence"] = datetime.utcnow().isoformat()
-        else:
-            self.error_metrics[error_type] = {
-                "error_type": error_type,
-                "count": 1,
-                "last_occurrence": datetime.utcnow().isoformat(),
-            }
+        self.error_rates.record(error_type)
         logger.warn(
             "Error tracked", {"session_id": session_id, "error_type": error_type}
         )
@@ -178,11 +441,17 @@ class SessionMonitor:
                     "user": metrics.user_message_count,
                     "agent": metrics.agent_message_count,
                 },
-                "api_usage": metrics.api_usage,
+                "api_usage": metrics.api_usage.to_dict(),
+                "latency_ms": self.latency_summary(metrics.latencies),
+                "process_latency_ms": self.latency_summary(self.process_latencies()),
                 "errors": metrics.error_count,
+                "loop_stalls": metrics.loop_stall_count,
                 "status": metrics.status,
             },
         )
 
 
-session_monitor = SessionMonitor()
+session_monitor = SessionMonitor(
+    max_ended_sessions=config.SESSION_HISTORY_SIZE,
+    ended_session_max_age=config.SESSION_HISTORY_MAX_AGE,
+)
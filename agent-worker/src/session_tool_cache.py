@@ -0,0 +1,97 @@
+"""
+Per-session tool results, deduplicated against the conversation.
+
+Callers often ask for the same thing twice in one call. Re-running the
+tool would put the same long text into the chat context a second time,
+and every later turn would pay for those input tokens again. A repeated
+call whose earlier output is still in the chat context gets a short
+reference to that output instead. If the earlier output has left the
+context (truncated or summarized), the cached text is returned again
+without re-running the tool.
+
+Results are keyed like the provider's response cache (tool_cache_key), so
+argument spelling and casing do not defeat deduplication. The cache
+belongs to one PortfolioAssistant and is released when its session ends.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from function_tools import ResponseCacheKey, tool_cache_key
+
+# Results shorter than this are cheaper to repeat than to reference
+MIN_REFERENCE_LENGTH = 200
+
+# Upper bound on distinct tool calls remembered per session
+MAX_SESSION_RESULTS = 64
+
+
+def _output_in_context(call_id: str, chat_items: Iterable[Any]) -> bool:
+    return any(
+        item.type == "function_call_output" and item.call_id == call_id
+        for item in chat_items
+    )
+
+
+class SessionToolCache:
+    """Tool results already given to one session's LLM"""
+
+    def __init__(self, max_entries: int = MAX_SESSION_RESULTS):
+        self.max_entries = max_entries
+        # Key -> (call id whose output carried the full text, result)
+        self._results: Dict[ResponseCacheKey, Tuple[str, str]] = {}
+        self.hits = 0
+        self.references = 0
+        self.characters_saved = 0
+
+    def lookup(
+        self,
+        function_name: str,
+        args: Dict[str, Any],
+        call_id: str,
+        chat_items: Iterable[Any],
+    ) -> Optional[str]:
+        """
+        Answer a repeated tool call from this session's earlier result
+        @param call_id Id of the call being answered
+        @param chat_items Current chat context items
+        @returns A reference to the earlier output if it is still in the chat
+        context, else the full earlier result; None if not called before
+        """
+        key = tool_cache_key(function_name, args)
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+
+        previous_call_id, result = entry
+        if len(result) >= MIN_REFERENCE_LENGTH and _output_in_context(
+            previous_call_id, chat_items
+        ):
+            self.references += 1
+            self.characters_saved += len(result)
+            return (
+                f"Same result as the earlier {function_name} call in this "
+                "conversation; answer from that output above."
+            )
+
+        # This call's output now carries the full text
+        self._results[key] = (call_id, result)
+        return result
+
+    def store(
+        self, function_name: str, args: Dict[str, Any], call_id: str, result: str
+    ):
+        key = tool_cache_key(function_name, args)
+        if key in self._results or len(self._results) < self.max_entries:
+            self._results[key] = (call_id, result)
+
+    def release(self):
+        self._results.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._results),
+            "hits": self.hits,
+            "references": self.references,
+            "characters_saved": self.characters_saved,
+        }
@@ -0,0 +1,150 @@
+"""
+Pluggable execution of function tools.
+
+Cheap tools, and heavy tools whose response is already cached, run
+inline on the event loop: dispatching them to a pool would cost more
+than running them. Tools listed in function_tools.HEAVY_FUNCTIONS, and
+getMore pages of their results, are dispatched to a thread or process
+pool with a per-call timeout, so one slow search cannot stall audio for
+every room in the process.
+
+Process workers cannot share the parent's provider. A call carries only
+the snapshot version; a worker that has no provider for that version
+fails the call with SnapshotMissingError, and the call is sent again
+with the snapshot's data. The worker builds a provider from it and
+reuses it for later calls, so the data crosses the process boundary once
+per worker and version instead of with every call.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from config import config
+from function_tools import (
+    PortfolioDataProvider,
+    PortfolioSnapshot,
+    execute_function_tool,
+    is_heavy_call,
+)
+from loop_monitor import loop_monitor
+from portfolio_data import PortfolioConfig
+
+MODE_INLINE = "inline"
+MODE_THREAD = "thread"
+MODE_PROCESS = "process"
+
+# Providers built inside a process worker, by snapshot version
+_worker_providers: Dict[int, PortfolioDataProvider] = {}
+_WORKER_PROVIDER_VERSIONS = 2
+
+
+class SnapshotMissingError(Exception):
+    """A process worker has no provider for the requested snapshot version"""
+
+
+def _execute_in_worker(version: int, function_name: str, args: Dict[str, Any]) -> str:
+    provider = _worker_providers.get(version)
+    if provider is None:
+        raise SnapshotMissingError(version)
+    return execute_function_tool(function_name, args, provider)
+
+
+def _load_in_worker(
+    version: int, data: PortfolioConfig, function_name: str, args: Dict[str, Any]
+) -> str:
+    """Build the provider for a snapshot version, then execute the call"""
+    if version not in _worker_providers:
+        while len(_worker_providers) >= _WORKER_PROVIDER_VERSIONS:
+            del _worker_providers[min(_worker_providers)]
+        _worker_providers[version] = PortfolioDataProvider(data)
+    return _execute_in_worker(version, function_name, args)
+
+
+class ToolExecutor:
+    def __init__(self, mode: str, max_workers: int, timeout: float):
+        if mode not in (MODE_INLINE, MODE_THREAD, MODE_PROCESS):
+            raise ValueError(f"Unknown tool executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.mode == MODE_PROCESS:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="tool"
+                )
+        return self._pool
+
+    def runs_inline(
+        self, snapshot: PortfolioSnapshot, function_name: str, args: Dict[str, Any]
+    ) -> bool:
+        return (
+            self.mode == MODE_INLINE
+            or not is_heavy_call(function_name, args)
+            or snapshot.provider.peek_cached_response(function_name, args) is not None
+        )
+
+    async def run(
+        self, snapshot: PortfolioSnapshot, function_name: str, args: Dict[str, Any]
+    ) -> str:
+        """
+        Execute a tool against a snapshot, inline or in the pool
+        @param snapshot Portfolio snapshot the session is pinned to
+        @param function_name Name of the tool
+        @param args Tool arguments
+        @returns Tool result
+        @raises asyncio.TimeoutError if a pooled call exceeds the timeout
+        """
+        if self.runs_inline(snapshot, function_name, args):
+            with loop_monitor.operation(f"tool.{function_name}"):
+                return execute_function_tool(function_name, args, snapshot.provider)
+
+        loop = asyncio.get_running_loop()
+        if self.mode == MODE_PROCESS:
+            future = self._run_in_process(snapshot, function_name, args)
+        else:
+            future = loop.run_in_executor(
+                self._get_pool(),
+                execute_function_tool,
+                function_name,
+                args,
+                snapshot.provider,
+            )
+
+        # On timeout the worker cannot be interrupted; its result is discarded
+        return await asyncio.wait_for(future, self.timeout)
+
+    async def _run_in_process(
+        self, snapshot: PortfolioSnapshot, function_name: str, args: Dict[str, Any]
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            return await loop.run_in_executor(
+                pool, _execute_in_worker, snapshot.version, function_name, args
+            )
+        except SnapshotMissingError:
+            # First call on this version in that worker: send the data once
+            return await loop.run_in_executor(
+                pool,
+                _load_in_worker,
+                snapshot.version,
+                snapshot.data,
+                function_name,
+                args,
+            )
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+tool_executor = ToolExecutor(
+    config.TOOL_EXECUTOR, config.TOOL_EXECUTOR_WORKERS, config.TOOL_TIMEOUT
+)
@@ -0,0 +1,98 @@
+"""
+Speculative tool prefetch from interim STT transcripts.
+
+While the user is still speaking, interim transcripts are matched against
+words that identify a single project title. The provider already
+pre-renders every no-arg, enum-arg and per-company call when a snapshot
+is built, so a specific project is the one call left to render ahead of
+time; it goes straight into the provider's response cache. The provider
+keys a project title and its id as the same call, so the LLM finds the
+rendered response whichever it passes. Matching is token-set lookups only.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+from function_tools import (
+    PortfolioSnapshot,
+    ResponseCacheKey,
+    execute_function_tool,
+)
+from search_index import tokenize
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+# Title words too generic to identify a single project on their own
+MIN_PROJECT_KEYWORD_LENGTH = 5
+
+# Tool calls rendered per transcript
+MAX_PREFETCH_PER_TRANSCRIPT = 3
+
+
+class IntentMatcher:
+    """Maps heard words to the tool calls they most likely lead to"""
+
+    def __init__(self, snapshot: PortfolioSnapshot):
+        self._rules: List[Tuple[FrozenSet[str], ToolCall]] = []
+        data = snapshot.data
+
+        title_tokens = [set(tokenize(project.title)) for project in data.projects]
+        for project, tokens in zip(data.projects, title_tokens):
+            call = ("getProjects", {"project_id": project.id})
+            for token in tokens:
+                shared = sum(token in other for other in title_tokens)
+                if len(token) >= MIN_PROJECT_KEYWORD_LENGTH and shared == 1:
+                    self._rules.append((frozenset((token,)), call))
+
+    def match(self, transcript: str) -> List[ToolCall]:
+        """Tool calls suggested by a transcript, most specific first"""
+        heard = set(tokenize(transcript))
+        if not heard:
+            return []
+        return [call for tokens, call in self._rules if tokens <= heard]
+
+
+@lru_cache(maxsize=4)
+def get_intent_matcher(snapshot: PortfolioSnapshot) -> IntentMatcher:
+    """Intent matcher shared by every session on the same data version"""
+    return IntentMatcher(snapshot)
+
+
+class ToolPrefetcher:
+    """Renders likely tool calls into the snapshot provider's response cache"""
+
+    def __init__(self, snapshot: PortfolioSnapshot):
+        self.snapshot = snapshot
+        self.matcher = get_intent_matcher(snapshot)
+        # Calls this session rendered ahead of time, to count hits
+        self._prefetched: Set[ResponseCacheKey] = set()
+        self._last_transcript = ""
+        self.prefetched = 0
+        self.hits = 0
+
+    def on_transcript(self, transcript: str):
+        """Warm the uncached tools an interim or final transcript points at"""
+        if transcript == self._last_transcript:
+            return
+        self._last_transcript = transcript
+
+        provider = self.snapshot.provider
+        budget = MAX_PREFETCH_PER_TRANSCRIPT
+        for function_name, args in self.matcher.match(transcript):
+            if budget == 0:
+                break
+            if provider.peek_cached_response(function_name, args) is not None:
+                continue
+            execute_function_tool(function_name, args, provider)
+            self._prefetched.add(provider.cache_key(function_name, args))
+            self.prefetched += 1
+            budget -= 1
+
+    def record_call(self, function_name: str, args: Dict[str, Any]):
+        """Count a tool call that a transcript had already warmed"""
+        key = self.snapshot.provider.cache_key(function_name, args)
+        if key in self._prefetched:
+            self.hits += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"prefetched": self.prefetched, "hits": self.hits}
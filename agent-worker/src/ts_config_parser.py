@@ -0,0 +1,197 @@
+"""
+Extractor for object literals in TypeScript config files.
+
+Parses the JSON-like subset of TypeScript used by config/portfolio.ts
+(object and array literals, quoted or bare keys, string/number/boolean
+literals, comments and trailing commas) without needing a Node runtime.
+"""
+
+import re
+from typing import Any, List
+
+_ESCAPES = {
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+    "0": "\0",
+}
+
+_NUMBER_PATTERN = re.compile(
+    r"-?(?:0[xX][0-9a-fA-F_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+)
+_IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_$][\w$]*")
+_LITERALS = {"true": True, "false": False, "null": None, "undefined": None}
+
+
+class TypeScriptParseError(ValueError):
+    pass
+
+
+class _ObjectLiteralParser:
+    def __init__(self, source: str, position: int):
+        self.source = source
+        self.position = position
+
+    def error(self, message: str) -> TypeScriptParseError:
+        line = self.source.count("\n", 0, self.position) + 1
+        return TypeScriptParseError(f"{message} at line {line}")
+
+    def skip_whitespace(self):
+        source = self.source
+        while self.position < len(source):
+            char = source[self.position]
+            if char.isspace():
+                self.position += 1
+            elif source.startswith("//", self.position):
+                newline = source.find("\n", self.position)
+                self.position = len(source) if newline == -1 else newline + 1
+            elif source.startswith("/*", self.position):
+                end = source.find("*/", self.position + 2)
+                if end == -1:
+                    raise self.error("Unterminated comment")
+                self.position = end + 2
+            else:
+                return
+
+    def peek(self) -> str:
+        self.skip_whitespace()
+        return self.source[self.position : self.position + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error(f"Expected '{char}'")
+        self.position += 1
+
+    def parse_value(self) -> Any:
+        char = self.peek()
+        if char == "{":
+            return self.parse_object()
+        if char == "[":
+            return self.parse_array()
+        if char in "'\"`":
+            return self.parse_string()
+
+        number = _NUMBER_PATTERN.match(self.source, self.position)
+        if number:
+            self.position = number.end()
+            text = number.group().replace("_", "")
+            if text.lower().lstrip("-").startswith("0x"):
+                return int(text, 16)
+            value = float(text)
+            return int(value) if value.is_integer() and "." not in text else value
+
+        identifier = _IDENTIFIER_PATTERN.match(self.source, self.position)
+        if identifier and identifier.group() in _LITERALS:
+            self.position = identifier.end()
+            return _LITERALS[identifier.group()]
+
+        raise self.error("Unsupported expression")
+
+    def parse_string(self) -> str:
+        quote = self.source[self.position]
+        self.position += 1
+        chunks: List[str] = []
+        source = self.source
+        while self.position < len(source):
+            char = source[self.position]
+            if char == quote:
+                self.position += 1
+                return "".join(chunks)
+            if char == "\\":
+                escaped = source[self.position + 1 : self.position + 2]
+                if escaped == "u":
+                    chunks.append(
+                        chr(int(source[self.position + 2 : self.position + 6], 16))
+                    )
+                    self.position += 6
+                    continue
+                if escaped == "\n":
+                    # Line continuation
+                    self.position += 2
+                    continue
+                chunks.append(_ESCAPES.get(escaped, escaped))
+                self.position += 2
+                continue
+            if quote == "`" and source.startswith("${", self.position):
+                raise self.error("Template literal interpolation is not supported")
+            if char == "\n" and quote != "`":
+                raise self.error("Unterminated string")
+            chunks.append(char)
+            self.position += 1
+        raise self.error("Unterminated string")
+
+    def parse_key(self) -> str:
+        char = self.peek()
+        if char in "'\"":
+            return self.parse_string()
+        identifier = _IDENTIFIER_PATTERN.match(self.source, self.position)
+        if not identifier:
+            raise self.error("Expected property name")
+        self.position = identifier.end()
+        return identifier.group()
+
+    def parse_object(self) -> dict:
+        self.expect("{")
+        result = {}
+        while self.peek() != "}":
+            if self.source.startswith("...", self.position):
+                raise self.error("Spread properties are not supported")
+            key = self.parse_key()
+            self.expect(":")
+            result[key] = self.parse_value()
+            if self.peek() == ",":
+                self.position += 1
+            elif self.peek() != "}":
+                raise self.error("Expected ',' or '}'")
+        self.position += 1
+        return result
+
+    def parse_array(self) -> list:
+        self.expect("[")
+        result = []
+        while self.peek() != "]":
+            result.append(self.parse_value())
+            if self.peek() == ",":
+                self.position += 1
+            elif self.peek() != "]":
+                raise self.error("Expected ',' or ']'")
+        self.position += 1
+        return result
+
+
+def _find_default_export(source: str) -> int:
+    """Locate the exported object literal, returning its start offset"""
+    export = re.search(r"export\s+default\s+", source)
+    if export:
+        if source[export.end() : export.end() + 1] == "{":
+            return export.end()
+        name = _IDENTIFIER_PATTERN.match(source, export.end())
+        if name:
+            declaration = re.search(
+                rf"(?:const|let|var)\s+{re.escape(name.group())}\s*(?::[^=]+)?=\s*",
+                source,
+            )
+            if declaration:
+                return declaration.end()
+
+    named = re.search(r"export\s+const\s+[A-Za-z_$][\w$]*\s*(?::[^=]+)?=\s*\{", source)
+    if named:
+        return named.end() - 1
+
+    raise TypeScriptParseError("No exported object literal found")
+
+
+def parse_exported_object(source: str) -> dict:
+    """
+    Extract the default-exported (or first exported const) object literal
+    @param source TypeScript source code
+    @returns The object literal as nested dicts and lists
+    """
+    position = _find_default_export(source)
+    parser = _ObjectLiteralParser(source, position)
+    if parser.peek() != "{":
+        raise parser.error("Exported value is not an object literal")
+    return parser.parse_object()
@@ -0,0 +1,119 @@
+"""
+Token-budgeted tool output for voice answers.
+
+The agent answers in three or four spoken sentences, so a tool result only
+needs the few most relevant facts. In voice mode, list-style tools render
+one brief block per item (top-ranked achievements, leading technologies)
+in relevance order. Those blocks are then packed into pages that fit a
+token budget. When more pages remain, the result ends with a continuation
+handle that the LLM can pass to the getMore tool if the caller asks for
+more.
+
+Handles are stateless: they encode the original tool call and the page
+number. Any provider for the same snapshot, in any process, can serve a
+handle by rendering the call again, usually from its response cache.
+"""
+
+import math
+import re
+from typing import AbstractSet, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+OUTPUT_FULL = "full"
+OUTPUT_VOICE = "voice"
+
+# Rough tokens-per-character ratio for English prose
+CHARACTERS_PER_TOKEN = 4
+
+_QUANTIFIED = re.compile(r"\d")
+
+PAGE_PARAM = "page"
+
+NO_MORE_RESULTS = "No more results."
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARACTERS_PER_TOKEN)
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """Cut text to the token budget at the last line or sentence that fits"""
+    limit = budget * CHARACTERS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    if boundary > limit // 2:
+        cut = cut[: boundary + 1]
+    return cut.rstrip() + " ..."
+
+
+def top_achievements(achievements: List[str], limit: int) -> List[str]:
+    """
+    Pick the achievements worth saying out loud
+    @returns Up to limit achievements, quantified ones (with numbers) first,
+    otherwise in their original order
+    """
+    ranked = sorted(
+        range(len(achievements)),
+        key=lambda index: (not _QUANTIFIED.search(achievements[index]), index),
+    )
+    return [achievements[index] for index in ranked[:limit]]
+
+
+def iter_pages(blocks: Iterable[str], budget: int) -> Iterator[List[str]]:
+    """
+    Pack blocks, most relevant first, into pages that fit the token budget
+    @param blocks Consumed lazily: a page is yielded as soon as the next
+    block does not fit, so later blocks need not be rendered
+    @returns Pages in order; an oversized block gets a truncated page of its own
+    """
+    page: List[str] = []
+    used = 0
+    for block in blocks:
+        tokens = estimate_tokens(block)
+        if page and used + tokens > budget:
+            yield page
+            page, used = [], 0
+        if not page and tokens > budget:
+            yield [truncate_to_budget(block, budget)]
+            continue
+        page.append(block)
+        used += tokens
+    if page:
+        yield page
+
+
+def encode_handle(function_name: str, args: Dict[str, Any], page: int) -> str:
+    """Continuation handle for a page (1-based) of a tool call's output"""
+    params = sorted(
+        (key, str(value).lower() if isinstance(value, bool) else str(value))
+        for key, value in args.items()
+        if value is not None
+    )
+    return f"{function_name}?{urlencode([*params, (PAGE_PARAM, str(page))])}"
+
+
+def decode_handle(
+    handle: str, boolean_params: AbstractSet[str] = frozenset()
+) -> Optional[Tuple[str, Dict[str, Any], int]]:
+    """
+    Parse a continuation handle
+    @param boolean_params Arguments to read back as booleans; all others stay text
+    @returns (function name, args, page), or None if the handle is malformed
+    """
+    function_name, separator, query = handle.strip().partition("?")
+    if not separator:
+        return None
+    args: Dict[str, Any] = {}
+    page = None
+    for key, value in parse_qsl(query):
+        if key == PAGE_PARAM:
+            page = int(value) if value.isdigit() else None
+        elif key in boolean_params and value in ("true", "false"):
+            args[key] = value == "true"
+        else:
+            args[key] = value
+    if not page:
+        return None
+    return function_name, args, page
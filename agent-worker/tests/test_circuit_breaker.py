@@ -0,0 +1,64 @@
+import pytest
+
+import circuit_breaker
+from circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _open_breaker(clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("llm", failure_threshold=2, recovery_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    return breaker
+
+
+def test_opens_after_threshold_and_fails_fast(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 29
+    assert not breaker.allow()
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()  # One probe at a time
+    assert breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert not breaker.allow()
+
+
+def test_unrecorded_probe_expires_after_recovery_timeout(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert breaker.allow()  # Probe cancelled before it records an outcome
+
+    clock[0] += 29
+    assert not breaker.allow()
+    clock[0] += 1
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.record_success()
+    assert breaker.state == STATE_CLOSED
@@ -0,0 +1,53 @@
+import pytest
+
+from error_rates import ErrorRates, SlidingWindowCounter
+
+
+def test_counts_within_window_and_expires_old_buckets():
+    counter = SlidingWindowCounter(window=60, bucket_seconds=10)
+    counter.add(now=0)
+    counter.add(2, now=15)
+    assert counter.count(now=15) == 3
+    assert counter.count(now=59) == 3
+    # The bucket holding t=0 leaves the window after 60s
+    assert counter.count(now=60) == 2
+    assert counter.count(now=79) == 0
+
+
+def test_reused_bucket_is_reset():
+    counter = SlidingWindowCounter(window=30, bucket_seconds=10)
+    counter.add(5, now=0)
+    # Same ring slot as t=0, one full revolution later
+    counter.add(now=30)
+    assert counter.count(now=30) == 1
+
+
+def test_shorter_window_counts_trailing_buckets_only():
+    counter = SlidingWindowCounter(window=900, bucket_seconds=10)
+    counter.add(now=0)
+    counter.add(now=250)
+    counter.add(now=295)
+    assert counter.count(60, now=299) == 2
+    assert counter.count(300, now=299) == 3
+    assert counter.window == 900
+
+
+def test_error_rates_summary():
+    rates = ErrorRates(bucket_seconds=10)
+    for now in (0, 100, 110):
+        rates.record("tool", now=now)
+    rates.record("llm_error", now=110)
+
+    assert rates.count("tool", 60, now=110) == 2
+    assert rates.rate("tool", 60, now=110) == pytest.approx(2 / 60)
+    assert rates.count("missing", 60) == 0
+
+    summary = rates.summary(now=110)
+    assert list(summary) == ["llm_error", "tool"]
+    assert summary["tool"]["count"] == 3
+    assert summary["tool"]["rates"] == {
+        "1m": round(2 / 60, 4),
+        "5m": round(3 / 300, 4),
+        "15m": round(3 / 900, 4),
+    }
+    assert summary["tool"]["last_occurrence"]
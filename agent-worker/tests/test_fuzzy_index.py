@@ -0,0 +1,117 @@
+import pytest
+
+from function_tools import PortfolioDataProvider
+from fuzzy_index import (
+    COMPACT_MATCH_SCORE,
+    PHONETIC_MATCH_SCORE,
+    PREFIX_MATCH_SCORE,
+    FuzzyIndex,
+    compact_key,
+    phonetic_key,
+)
+
+NAMES = [
+    "Healthtrip",
+    "AST Consulting",
+    "Microsoft",
+    "LeetCode MCP Server",
+    "Redis",
+    "Redux",
+    "Kubernetes",
+]
+
+
+def _index(threshold=None) -> FuzzyIndex:
+    index = FuzzyIndex() if threshold is None else FuzzyIndex(threshold)
+    for name in NAMES:
+        index.add(name, name.lower())
+    return index.build()
+
+
+def test_keys():
+    assert compact_key("A.S.T Consulting") == "astconsulting"
+    assert phonetic_key("Healthtrip") == phonetic_key("helth trip")
+    assert phonetic_key("") == ""
+
+
+@pytest.mark.parametrize(
+    "query, name, score",
+    [
+        ("health trip", "Healthtrip", COMPACT_MATCH_SCORE),
+        ("A S T consulting", "AST Consulting", COMPACT_MATCH_SCORE),
+        ("Microsfot", "Microsoft", PHONETIC_MATCH_SCORE),
+        ("kubernetis", "Kubernetes", PHONETIC_MATCH_SCORE),
+        ("lead code", "LeetCode MCP Server", PREFIX_MATCH_SCORE),
+    ],
+)
+def test_match_tiers(query, name, score):
+    match = _index().lookup(query)
+    assert match is not None
+    assert (match.name, match.value, match.score) == (name, name.lower(), score)
+
+
+def test_phonetic_collisions_pick_the_closest_spelling():
+    index = _index()
+    assert index.lookup("reddis").name == "Redis"
+    assert index.lookup("reddux").name == "Redux"
+
+
+def test_short_sound_alike_keys_must_also_be_spelled_alike():
+    index = FuzzyIndex()
+    index.add("React", "react")
+    index.build()
+    # "rust" and "React" share the phonetic key r23 but no trigram
+    assert index.lookup("rust") is None
+    assert _index().lookup("reducks") is None
+
+
+def test_trigram_score_respects_threshold():
+    match = _index().lookup("kubernetes cluster")
+    assert match.name == "Kubernetes"
+    assert 0.6 <= match.score < PREFIX_MATCH_SCORE
+    assert _index(threshold=0.7).lookup("kubernetes cluster") is None
+
+
+def test_short_phonetic_keys_do_not_prefix_match():
+    # "lee" would be a phonetic prefix of LeetCode, but is too short to trust
+    assert _index().lookup("lee") is None
+
+
+def test_no_match():
+    index = _index()
+    assert index.lookup("zzz") is None
+    assert index.lookup("  ") is None
+    assert FuzzyIndex().build().lookup("redis") is None
+
+
+def test_first_added_name_wins_exact_key_ties():
+    index = FuzzyIndex()
+    index.add("Go", "language")
+    index.add("GO", "board game")
+    index.build()
+    assert index.lookup("go").value == "language"
+    assert len(index) == 2
+
+
+@pytest.fixture
+def provider():
+    return PortfolioDataProvider(output_mode="full")
+
+
+def test_provider_does_not_substitute_a_sound_alike_skill(provider):
+    assert provider.search_portfolio("rust") == "No results found for: rust"
+
+
+def test_provider_notes_fuzzy_substitutions(provider):
+    experience = provider.get_experience_summary("helth trip")
+    assert experience.startswith("No exact match for 'helth trip'; closest: Healthtrip")
+    project = provider.get_project_details(project_id="lead code")
+    assert project.startswith(
+        "No exact match for 'lead code'; closest: LeetCode MCP Server"
+    )
+
+
+def test_provider_does_not_note_spacing_differences(provider):
+    assert provider.get_experience_summary("health trip") == (
+        provider.get_experience_summary("Healthtrip")
+    )
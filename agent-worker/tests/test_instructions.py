@@ -0,0 +1,13 @@
+import pytest
+
+from function_tools import PortfolioDataProvider, PortfolioSnapshot
+from instructions import VOICE_OUTPUT_RULES, build_instructions
+
+
+@pytest.mark.parametrize("output_mode", ["voice", "full"])
+def test_trimming_rule_only_in_voice_mode(output_mode):
+    provider = PortfolioDataProvider(output_mode=output_mode)
+    text = build_instructions(PortfolioSnapshot(1, provider)).text
+    assert (VOICE_OUTPUT_RULES in text) is (output_mode == "voice")
+    assert "8) tone = chill, sharp, confident, not corporate-marketing\n" in text
+    assert "\n\n\ndata you can use:" not in text
@@ -0,0 +1,64 @@
+import pytest
+
+from latency_histogram import LatencyHistogram
+
+
+def _histogram(*values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    return histogram
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == {
+        "count": 0,
+        "mean": None,
+        "max": None,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+    }
+
+
+def test_percentiles_interpolate_inside_the_bucket():
+    # Two samples in (50, 75] and two in (100, 150]
+    histogram = _histogram(51, 74, 101, 149)
+    assert histogram.percentile(25) == pytest.approx(62.5)
+    assert histogram.percentile(50) == pytest.approx(75)
+    assert histogram.percentile(75) == pytest.approx(125)
+
+
+def test_percentiles_are_clamped_to_observed_range():
+    histogram = _histogram(120, 120, 120)
+    assert histogram.percentile(1) == 120
+    assert histogram.percentile(99) == 120
+    assert _histogram(51, 74, 101, 149).percentile(100) == 149
+
+
+def test_overflow_bucket_interpolates_up_to_max():
+    histogram = _histogram(40000, 50000)
+    assert histogram.percentile(50) == pytest.approx(40000)
+
+
+def test_bucket_bounds_are_inclusive():
+    histogram = _histogram(100)
+    assert histogram.counts[7] == 1  # (75, 100]
+
+
+def test_merge_adds_counts_and_extremes():
+    merged = _histogram(10, 20)
+    merged.merge(_histogram(5, 400))
+    assert merged.count == 4
+    assert merged.total == 435
+    assert (merged.min, merged.max) == (5, 400)
+    assert merged.counts == _histogram(10, 20, 5, 400).counts
+
+
+def test_summary_rounds_values():
+    summary = _histogram(10.123, 20.456).summary()
+    assert summary["count"] == 2
+    assert summary["mean"] == 15.29
+    assert summary["max"] == 20.46
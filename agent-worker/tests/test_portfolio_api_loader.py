@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import portfolio_data
+from portfolio_data import PortfolioApiLoader
+from ts_config_parser import parse_exported_object
+
+PORTFOLIO_TS = os.path.join(
+    os.path.dirname(__file__), "..", "..", "config", "portfolio.ts"
+)
+ETAG = '"v1"'
+LAST_MODIFIED = "Sun, 18 Oct 2026 00:00:00 GMT"
+
+
+@pytest.fixture
+def payload():
+    with open(PORTFOLIO_TS) as f:
+        return parse_exported_object(f.read())
+
+
+@pytest.fixture
+def requests():
+    return []
+
+
+@pytest.fixture
+def behaviour():
+    return {"delay": 0.0, "body": None}
+
+
+@pytest.fixture
+async def server(payload, requests, behaviour):
+    async def portfolio(request: web.Request) -> web.Response:
+        requests.append(dict(request.headers))
+        if behaviour["delay"]:
+            await asyncio.sleep(behaviour["delay"])
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304, headers={"ETag": ETAG})
+        return web.Response(
+            text=behaviour["body"] or json.dumps(payload),
+            content_type="application/json",
+            headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED},
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/portfolio", portfolio)
+    async with TestServer(app) as test_server:
+        yield test_server
+
+
+@pytest.fixture
+async def make_loader(server, tmp_path):
+    loaders = []
+
+    def make(timeout: float = 2.0) -> PortfolioApiLoader:
+        loader = PortfolioApiLoader(
+            str(server.make_url("/api/portfolio")),
+            timeout,
+            snapshot_path=str(tmp_path / "snapshot.json"),
+        )
+        loaders.append(loader)
+        return loader
+
+    yield make
+    for loader in loaders:
+        await loader.close()
+
+
+async def test_fetch_then_revalidate_with_etag(make_loader, payload, requests):
+    loader = make_loader()
+
+    data = await loader.fetch()
+    assert data is not None
+    assert data.personal.name == payload["personal"]["name"]
+    assert "If-None-Match" not in requests[0]
+
+    assert await loader.fetch() is None
+    assert requests[1]["If-None-Match"] == ETAG
+    assert requests[1]["If-Modified-Since"] == LAST_MODIFIED
+
+
+async def test_validators_are_restored_from_snapshot(make_loader, requests):
+    assert await make_loader().fetch() is not None
+
+    # A fresh process starts from the persisted snapshot
+    assert await make_loader().fetch() is None
+    assert requests[-1]["If-None-Match"] == ETAG
+
+
+async def test_timeout_falls_back_to_snapshot(
+    make_loader, behaviour, payload, monkeypatch
+):
+    fresh = await make_loader().fetch()
+
+    behaviour["delay"] = 0.5
+    slow = make_loader(timeout=0.05)
+    slow.load_snapshot()
+    slow._etag = None  # Force a full download that times out
+    assert await slow.fetch() is None
+
+    monkeypatch.setattr(portfolio_data, "_api_loader", slow)
+    assert portfolio_data.load_from_api() == fresh
+
+
+async def test_malformed_payload_is_rejected(make_loader, behaviour, tmp_path):
+    behaviour["body"] = json.dumps({"skills": []})  # No "personal" section
+    assert await make_loader().fetch() is None
+
+    behaviour["body"] = "{not json"
+    assert await make_loader().fetch() is None
+    assert not (tmp_path / "snapshot.json").exists()
@@ -0,0 +1,73 @@
+from search_index import PREFIX_MATCH_WEIGHT, SearchIndex, tokenize
+
+
+def _index(*documents):
+    index = SearchIndex()
+    for name, text in documents:
+        index.add_document(name, [(text, 1.0)])
+    return index.build()
+
+
+def test_tokenize_drops_stop_words_and_keeps_symbols():
+    assert tokenize("What is the C++ and C# work at Next.js?") == [
+        "c++",
+        "c#",
+        "work",
+        "next",
+        "js",
+    ]
+
+
+def test_rare_terms_outweigh_common_terms():
+    index = _index(
+        ("a", "python api"),
+        ("b", "python kafka"),
+        ("c", "python api"),
+    )
+    ranked = [name for name, _score in index.search("python kafka")]
+    assert ranked[0] == "b"
+    assert set(ranked) == {"a", "b", "c"}
+
+
+def test_term_frequency_saturates_and_short_documents_win():
+    index = _index(
+        ("short", "redis"),
+        ("long", "redis cache layer for the search service and queue workers"),
+    )
+    scores = dict(index.search("redis"))
+    assert scores["short"] > scores["long"]
+
+
+def test_field_weight_counts_terms_more_than_once():
+    index = SearchIndex()
+    index.add_document("title", [("kubernetes", 2.0), ("deploy", 1.0)])
+    index.add_document("body", [("kubernetes", 1.0), ("deploy", 1.0)])
+    index.build()
+    assert [name for name, _ in index.search("kubernetes")] == ["title", "body"]
+
+
+def test_indexed_terms_are_not_prefix_expanded():
+    index = _index(("exact", "kube"), ("prefixed", "kubernetes"))
+    assert [name for name, _ in index.search("kube")] == ["exact"]
+
+
+def test_prefix_expansion_applies_match_weight():
+    index = _index(("doc", "kubernetes"), ("other", "django"))
+    exact = dict(index.search("kubernetes"))["doc"]
+    prefixed = dict(index.search("kuber"))["doc"]
+    assert prefixed == exact * PREFIX_MATCH_WEIGHT
+
+
+def test_short_unknown_terms_do_not_expand():
+    index = _index(("doc", "golang"))
+    assert index.search("go") == []
+
+
+def test_ties_keep_insertion_order_and_limit_applies():
+    index = _index(("first", "react"), ("second", "react"), ("third", "react"))
+    assert [name for name, _ in index.search("react", limit=2)] == ["first", "second"]
+
+
+def test_no_match_and_empty_index():
+    assert _index(("doc", "python")).search("rust") == []
+    assert SearchIndex().build().search("python") == []
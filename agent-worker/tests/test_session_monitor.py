@@ -0,0 +1,51 @@
+import threading
+
+from session_monitor import SessionMonitor
+
+
+def _in_thread(target):
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def test_process_latencies_merge_every_thread():
+    monitor = SessionMonitor()
+    monitor.track_latency("missing", "llm_ttft", 100)
+    _in_thread(lambda: monitor.track_latency("missing", "llm_ttft", 300))
+    _in_thread(lambda: monitor.track_loop_lag(4))
+
+    latencies = monitor.process_latencies()
+    assert latencies["llm_ttft"].count == 2
+    assert latencies["llm_ttft"].total == 400
+    assert latencies["event_loop_lag"].count == 1
+    # Exited threads are folded in once and not kept around
+    assert len(monitor._thread_latencies) == 1
+    assert monitor.process_latencies()["llm_ttft"].count == 2
+
+    monitor.reset_latencies()
+    assert monitor.process_latencies() == {}
+
+
+def test_recording_does_not_wait_for_the_lock():
+    monitor = SessionMonitor()
+    monitor.start_session("s1", "room")
+    go, recorded = threading.Event(), threading.Event()
+
+    def job():
+        monitor.track_latency("s1", "llm_ttft", 1)  # first sample registers
+        go.wait()
+        monitor.track_latency("s1", "llm_ttft", 2)
+        monitor.track_loop_lag(3, threading.get_ident())
+        recorded.set()
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    with monitor.lock:  # as build_snapshot holds it while it copies
+        go.set()
+        assert recorded.wait(5)
+    thread.join()
+
+    assert monitor.process_latencies()["llm_ttft"].count == 2
+    # The session started on this thread, not the job's
+    assert "event_loop_lag" not in monitor.sessions["s1"].latencies
@@ -0,0 +1,88 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import tool_executor
+from function_tools import (
+    PortfolioDataProvider,
+    PortfolioSnapshot,
+    execute_function_tool,
+)
+from tool_executor import MODE_PROCESS, SnapshotMissingError, ToolExecutor
+
+ARGS = {"query": "python"}
+
+
+@pytest.fixture
+def snapshot():
+    return PortfolioSnapshot(version=7, provider=PortfolioDataProvider())
+
+
+@pytest.fixture
+def worker_providers(monkeypatch):
+    providers = {}
+    monkeypatch.setattr(tool_executor, "_worker_providers", providers)
+    return providers
+
+
+def test_worker_fails_on_an_unknown_version(snapshot, worker_providers):
+    with pytest.raises(SnapshotMissingError):
+        tool_executor._execute_in_worker(7, "searchPortfolio", ARGS)
+
+    tool_executor._load_in_worker(7, snapshot.data, "searchPortfolio", ARGS)
+    assert list(worker_providers) == [7]
+    # Later calls on the version need no data
+    assert tool_executor._execute_in_worker(7, "searchPortfolio", ARGS)
+
+
+def test_worker_keeps_the_newest_versions(snapshot, worker_providers):
+    for version in (1, 2, 3):
+        tool_executor._load_in_worker(version, snapshot.data, "getSkills", {})
+    assert sorted(worker_providers) == [2, 3]
+
+
+class RecordingPool(ProcessPoolExecutor):
+    """Process pool that records which worker functions were submitted"""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(fn.__name__)
+        return super().submit(fn, *args, **kwargs)
+
+
+async def test_process_mode_sends_the_data_once_per_worker(snapshot):
+    executor = ToolExecutor(MODE_PROCESS, max_workers=1, timeout=30)
+    pool = executor._pool = RecordingPool()
+    try:
+        # Rendered apart from the snapshot, whose cache would keep calls inline
+        provider = PortfolioDataProvider(snapshot.data)
+        expected = execute_function_tool("searchPortfolio", ARGS, provider)
+        assert await executor.run(snapshot, "searchPortfolio", ARGS) == expected
+        assert await executor.run(snapshot, "searchPortfolio", ARGS) == expected
+    finally:
+        executor.shutdown()
+    assert pool.submitted == [
+        "_execute_in_worker",
+        "_load_in_worker",
+        "_execute_in_worker",
+    ]
+
+
+@pytest.mark.parametrize(
+    "function_name, args, inline",
+    [
+        ("getSkills", {}, True),
+        ("searchPortfolio", {"query": "kafka"}, False),
+        ("getMore", {"handle": "searchPortfolio?query=kafka&page=2"}, False),
+        ("getMore", {"handle": "getExperience?page=2"}, True),
+        ("getMore", {"handle": "not a handle"}, True),
+    ],
+)
+def test_heavy_calls_and_their_pages_leave_the_loop(
+    snapshot, function_name, args, inline
+):
+    executor = ToolExecutor("thread", max_workers=1, timeout=30)
+    assert executor.runs_inline(snapshot, function_name, args) is inline
@@ -0,0 +1,50 @@
+import pytest
+
+from function_tools import (
+    PortfolioDataProvider,
+    PortfolioSnapshot,
+    execute_function_tool,
+)
+from tool_prefetch import ToolPrefetcher
+
+
+@pytest.fixture
+def snapshot():
+    return PortfolioSnapshot(version=1, provider=PortfolioDataProvider())
+
+
+def _leetcode(snapshot):
+    return next(p for p in snapshot.data.projects if "LeetCode" in p.title)
+
+
+def test_project_title_and_id_share_a_cache_entry(snapshot):
+    provider = snapshot.provider
+    project = _leetcode(snapshot)
+    by_id = provider.cache_key("getProjects", {"projectId": project.id})
+    assert provider.cache_key("getProjects", {"project_id": project.title}) == by_id
+    assert provider.cache_key("getProjects", {"project_id": "leetcode mcp server"}) == (
+        by_id
+    )
+    # A fuzzy match is answered differently, so it keeps its own entry
+    assert provider.cache_key("getProjects", {"project_id": "lead code"}) != by_id
+
+
+def test_transcript_warms_the_call_the_llm_makes(snapshot):
+    project = _leetcode(snapshot)
+    prefetcher = ToolPrefetcher(snapshot)
+    prefetcher.on_transcript("tell me about the leetcode project")
+    assert prefetcher.prefetched == 1
+
+    args = {"project_id": project.title}
+    cached = snapshot.provider.peek_cached_response("getProjects", args)
+    assert cached is not None
+    assert execute_function_tool("getProjects", args, snapshot.provider) == cached
+
+    prefetcher.record_call("getProjects", args)
+    assert prefetcher.stats() == {"prefetched": 1, "hits": 1}
+
+
+def test_prewarmed_topics_are_not_rendered_again(snapshot):
+    prefetcher = ToolPrefetcher(snapshot)
+    prefetcher.on_transcript("what skills and experience does he have")
+    assert prefetcher.prefetched == 0
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from portfolio_data import parse_typescript_config
+from ts_config_parser import TypeScriptParseError, parse_exported_object
+
+PORTFOLIO_TS = os.path.join(
+    os.path.dirname(__file__), "..", "..", "config", "portfolio.ts"
+)
+
+
+def test_parses_website_portfolio_config():
+    with open(PORTFOLIO_TS) as f:
+        source = f.read()
+
+    raw = parse_exported_object(source)
+    assert set(raw) >= {"personal", "skills", "experience", "projects", "education"}
+    assert {"name": "React", "category": "frontend", "icon": "react"} in raw["skills"]
+
+    portfolio = parse_typescript_config(source)
+    assert portfolio.personal.name == raw["personal"]["name"]
+    assert [exp.company for exp in portfolio.experience] == [
+        exp["company"] for exp in raw["experience"]
+    ]
+    assert all(project.id and project.title for project in portfolio.projects)
+
+
+def test_literals_comments_and_trailing_commas():
+    source = """
+    // leading comment
+    const config: Config = {
+      name: 'single',  /* inline */
+      "quoted key": "double",
+      template: `multi
+    line`,
+      count: 1_000,
+      ratio: 0.5,
+      exponent: 1e3,
+      hex: 0xff,
+      negative: -2,
+      flags: [true, false, null, undefined,],
+      nested: { escaped: 'it\\'s \\u00e9\\n', },
+    };
+    export default config;
+    """
+    assert parse_exported_object(source) == {
+        "name": "single",
+        "quoted key": "double",
+        "template": "multi\n    line",
+        "count": 1000,
+        "ratio": 0.5,
+        "exponent": 1000.0,
+        "hex": 255,
+        "negative": -2,
+        "flags": [True, False, None, None],
+        "nested": {"escaped": "it's é\n"},
+    }
+
+
+def test_inline_default_and_named_exports():
+    assert parse_exported_object("export default { a: 1 };") == {"a": 1}
+    assert parse_exported_object("export const x: T = { b: [2] };") == {"b": [2]}
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("const a = 1;", "No exported object literal found"),
+        ("export default { a: `${x}` };", "interpolation"),
+        ("export default { ...base };", "Spread"),
+        ("export default { a: someCall() };", "Unsupported expression"),
+        ("export default {\n a: 'open\n};", "Unterminated string at line 2"),
+        ("export default { a: 1 b: 2 };", "Expected ',' or '}'"),
+    ],
+)
+def test_unsupported_syntax_raises(source, message):
+    with pytest.raises(TypeScriptParseError, match=message):
+        parse_exported_object(source)
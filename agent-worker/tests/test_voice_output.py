@@ -0,0 +1,114 @@
+import pytest
+
+from function_tools import PortfolioDataProvider
+from voice_output import (
+    NO_MORE_RESULTS,
+    decode_handle,
+    encode_handle,
+    estimate_tokens,
+    iter_pages,
+    top_achievements,
+    truncate_to_budget,
+)
+
+
+def paginate(blocks, budget):
+    return list(iter_pages(blocks, budget))
+
+
+def test_paginate_packs_blocks_in_order_within_budget():
+    blocks = ["a" * 40, "b" * 40, "c" * 40]  # 10 tokens each
+    assert paginate(blocks, 20) == [blocks[:2], blocks[2:]]
+    assert paginate(blocks, 30) == [blocks]
+    assert paginate([], 30) == []
+
+
+def test_pages_render_blocks_only_up_to_the_page_needed():
+    rendered = []
+
+    def blocks():
+        for index in range(100):
+            rendered.append(index)
+            yield "x" * 40  # 10 tokens
+
+    first_page = next(iter_pages(blocks(), 20))
+    assert len(first_page) == 2
+    # The third block was needed to find that the page was full
+    assert rendered == [0, 1, 2]
+
+
+def test_oversized_block_gets_a_truncated_page_of_its_own():
+    long_block = "First sentence. " * 20
+    pages = paginate(["short", long_block, "tail"], 10)
+    assert pages[0] == ["short"]
+    assert len(pages[1]) == 1
+    assert pages[1][0].endswith(" ...")
+    assert estimate_tokens(pages[1][0]) <= 11
+    assert pages[2] == ["tail"]
+
+
+def test_truncate_cuts_at_a_sentence_boundary():
+    text = "One two three. Four five six. Seven eight nine."
+    assert truncate_to_budget(text, 100) == text
+    assert truncate_to_budget(text, 6) == "One two three. ..."
+    assert truncate_to_budget(text, 8) == "One two three. Four five six. ..."
+
+
+def test_top_achievements_prefers_quantified_ones():
+    achievements = ["Led migration", "Cut latency by 38%", "Mentored", "Served 10k"]
+    assert top_achievements(achievements, 3) == [
+        "Cut latency by 38%",
+        "Served 10k",
+        "Led migration",
+    ]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        {"company": "AST Consulting"},
+        {"query": "c++ & next.js?"},
+        {"query": "true"},
+        {"featured": True, "project_id": "false"},
+        {"featured": False},
+        {},
+    ],
+)
+def test_handle_round_trip(args):
+    handle = encode_handle("getProjects", {**args, "unused": None}, 3)
+    assert decode_handle(handle, {"featured"}) == ("getProjects", args, 3)
+
+
+@pytest.mark.parametrize(
+    "handle", ["getExperience", "getExperience?page=0", "getExperience?page=x", ""]
+)
+def test_malformed_handles(handle):
+    assert decode_handle(handle) is None
+
+
+@pytest.fixture
+def provider():
+    return PortfolioDataProvider(output_mode="voice", token_budget=60)
+
+
+def test_provider_pages_follow_handles_to_the_end(provider):
+    text = provider.get_experience_summary()
+    pages = [text]
+    while "handle: " in text:
+        handle = text.rsplit("handle: ", 1)[1].rstrip(")")
+        text = provider.get_more(handle)
+        pages.append(text)
+
+    assert len(pages) > 1
+    for exp in provider.data.experience:
+        assert sum(exp.company in page for page in pages) >= 1
+    assert provider.get_more("getExperience?page=99") == NO_MORE_RESULTS
+
+
+def test_search_past_the_last_page_is_plain(provider):
+    assert provider.get_more("searchPortfolio?query=python&page=99") == (
+        NO_MORE_RESULTS
+    )
+    assert provider.get_more("searchPortfolio?query=true&page=2") == (
+        "No results found for: true"
+    )